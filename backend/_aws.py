@@ -0,0 +1,25 @@
+"""
+Shared boto3 Session and botocore Config for the API (rag.dynamodb_prompts) and the
+backend's DynamoDB scripts.
+
+One Session (and one connection pool per client/resource built from it) instead of
+each module configuring its own; the pool is sized for the scripts' thread fan-outs.
+The region is read from the environment at import time and this module does not load
+.env itself: the app gets it through main.py/core.config, scripts call load_dotenv()
+before importing this module.
+"""
+
+import os
+
+import boto3
+from botocore.config import Config
+
+AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
+
+BOTO_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'mode': 'adaptive', 'max_attempts': 3},
+    tcp_keepalive=True,
+)
+
+SESSION = boto3.Session(region_name=AWS_REGION)
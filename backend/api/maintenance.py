@@ -10,8 +10,9 @@ from rag.vectorstore import vector_store
 from rag.process_and_upsert_reddit import process_and_upsert_reddit
 from rag.process_and_upsert_youtube import process_and_upsert_youtube
 from rag.process_and_upsert_podcast import process_and_upsert_podcast
-from rag.dynamodb_prompts import get_latest_prompt_template, AWS_REGION
+from rag.dynamodb_prompts import get_latest_prompt_template, with_template_kind, AWS_REGION
 import json
+import asyncio
 import logging
 import httpx
 import os
@@ -145,21 +146,15 @@ async def create_collection(
             collection_name=collection_name,
             vectors_config=VectorParams(size=vector_size, distance=distance_map[distance])
         )
+        vector_store.invalidate_collections_cache(collection_name)
         
-        # Create indexes on doc_type and post_id fields for efficient filtering
-        from qdrant_client.models import PayloadSchemaType
-        try:
-            vector_store.client.create_payload_index(
-                collection_name=collection_name,
-                field_name="doc_type",
-                field_schema=PayloadSchemaType.KEYWORD
-            )
-            logger.info(f"Created index on 'doc_type' field for collection: {collection_name}")
-        except Exception as index_error:
-            # Log but don't fail if index creation fails (e.g., index already exists)
-            logger.warning(f"Could not create index on 'doc_type' for {collection_name}: {index_error}")
+        # Create indexes on every field the searches filter on (doc_type, domain, surfaces, ...);
+        # the search path never creates them (older collections: backfill_payload_indexes.py)
+        if vector_store.ensure_payload_indexes(collection_name):
+            logger.info(f"Requested summary field indexes for collection: {collection_name}")
         
         # Create index on post_id field for duplicate prevention
+        from qdrant_client.models import PayloadSchemaType
         try:
             vector_store.client.create_payload_index(
                 collection_name=collection_name,
@@ -202,6 +197,7 @@ async def delete_collection(
         
         # Delete collection
         vector_store.client.delete_collection(collection_name=collection_name)
+        vector_store.invalidate_collections_cache(collection_name)
         
         logger.info(f"Deleted collection: {collection_name}")
         return {
@@ -453,7 +449,8 @@ async def upsert_data(
 
             # Use specialized processing for each data type
             if data_type == 'reddit':
-                count = process_and_upsert_reddit(data, collection_name)
+                # Runs its own event loop for concurrent embedding, so keep it off the request loop
+                count = await asyncio.to_thread(process_and_upsert_reddit, data, collection_name)
                 total_count += count
                 logger.info(f"Processed {count} Reddit records from {file.filename} to {collection_name}")
             elif data_type == 'youtube':
@@ -1246,7 +1243,7 @@ async def update_template(
         }
         
         # Put item into DynamoDB
-        table.put_item(Item=item)
+        table.put_item(Item=with_template_kind(item))
         
         logger.info(f"Updated template: {request.template_name} by {edited_by_sub} at {timestamp}")
         return {
@@ -0,0 +1,42 @@
+"""
+Backfill Script: Create filter payload indexes on existing summary collections
+
+New collections get their payload indexes when they are created (maintenance API), and the
+search path never creates them. Run this once for collections created before that, so
+filtered searches use the indexes instead of post-filtering.
+
+Usage:
+    python backfill_payload_indexes.py [collection ...]   (default: every collection)
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from rag.vectorstore import SUMMARY_INDEX_FIELDS, vector_store
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Create summary payload indexes on existing collections')
+    parser.add_argument('collections', nargs='*', help='Collections to index (default: all)')
+    args = parser.parse_args()
+
+    names = args.collections or [c.name for c in vector_store.client.get_collections().collections]
+    failed = []
+    for name in names:
+        # Index builds are requested asynchronously; Qdrant finishes them in the background
+        if vector_store.ensure_payload_indexes(name, SUMMARY_INDEX_FIELDS):
+            print(f"✓ {name}: requested indexes on {', '.join(SUMMARY_INDEX_FIELDS)}")
+        else:
+            failed.append(name)
+            print(f"✗ {name}: some index requests failed (see log)")
+
+    print(f"\nIndexed {len(names) - len(failed)}/{len(names)} collections")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
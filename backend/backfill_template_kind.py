@@ -0,0 +1,68 @@
+"""
+Backfill Script: Tag existing asset templates with template_kind
+
+Asset types are loaded with a Query on the asset_kind_idx GSI (partition key template_kind,
+sort key template_name). Items written before template_kind existed are not in that index,
+so run this once after creating the GSI - until then they are invisible to the Query.
+
+Usage:
+    python backfill_template_kind.py [--dry-run]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Load environment variables (AWS_REGION is read when _aws is imported)
+load_dotenv()
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from _aws import BOTO_CONFIG, SESSION
+from rag.dynamodb_prompts import ASSET_TEMPLATE_KIND, ASSET_TEMPLATE_PREFIX
+
+TABLE_NAME = 'prompts_templates_tbl'
+
+
+def untagged_asset_template_keys(client):
+    """Keys of every asset_template_* version that has no template_kind yet."""
+    pages = client.get_paginator('scan').paginate(
+        TableName=TABLE_NAME,
+        FilterExpression='begins_with(template_name, :prefix) AND attribute_not_exists(template_kind)',
+        ExpressionAttributeValues={':prefix': {'S': ASSET_TEMPLATE_PREFIX}},
+        ProjectionExpression='template_name, edited_at_iso'
+    )
+    for page in pages:
+        yield from page.get('Items', [])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Set template_kind on existing asset templates')
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Print what would be done without making changes'
+    )
+    args = parser.parse_args()
+
+    client = SESSION.client('dynamodb', config=BOTO_CONFIG)
+
+    count = 0
+    for key in untagged_asset_template_keys(client):
+        count += 1
+        print(f"{'[DRY RUN] ' if args.dry_run else ''}{key['template_name']['S']} @ {key['edited_at_iso']['N']}")
+        if not args.dry_run:
+            client.update_item(
+                TableName=TABLE_NAME,
+                Key=key,
+                UpdateExpression='SET template_kind = :kind',
+                ExpressionAttributeValues={':kind': {'S': ASSET_TEMPLATE_KIND}}
+            )
+
+    print(f"\n{'Would tag' if args.dry_run else 'Tagged'} {count} asset template versions")
+
+
+if __name__ == "__main__":
+    main()
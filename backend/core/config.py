@@ -60,6 +60,9 @@ class Settings:
         )
     )
     QDRANT_API_KEY: str = field(default_factory=lambda: os.getenv("QDRANT_API_KEY", ""))
+    # Use gRPC (protobuf over HTTP/2) instead of REST for Qdrant calls
+    QDRANT_PREFER_GRPC: bool = field(default_factory=lambda: os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes"))
+    QDRANT_GRPC_PORT: int = field(default_factory=lambda: int(os.getenv("QDRANT_GRPC_PORT", "6334")))
     ALLOWED_ORIGINS: str = field(default_factory=lambda: os.getenv("ALLOWED_ORIGINS", "http://localhost:3000,https://ansora-mvp.vercel.app"))
     STORAGE_PATH: str = field(default_factory=lambda: os.getenv("STORAGE_PATH", "./storage"))
     # Cognito configuration for JWT verification
@@ -67,6 +70,12 @@ class Settings:
     COGNITO_USER_POOL_ID: str = field(default_factory=lambda: os.getenv("COGNITO_USER_POOL_ID", "us-east-1_kOwOgLGdg"))
     DEEPINFRA_API_KEY: str = field(default_factory=lambda: os.getenv("DEEPINFRA_API_KEY", ""))
     DEEPINFRA_API_BASE_URL: str = field(default_factory=lambda: os.getenv("DEEPINFRA_API_BASE_URL", "https://api.deepinfra.com/v1/openai"))
+    # Embed search queries locally with fastembed (ONNX) instead of calling DeepInfra
+    USE_LOCAL_EMBED: bool = field(default_factory=lambda: os.getenv("USE_LOCAL_EMBED", "false").lower() in ("1", "true", "yes"))
+    # On-disk embedding cache for ingested documents (e.g. ~/.cache/ansora/embeddings); empty keeps it in memory only
+    EMBEDDING_CACHE_DIR: str = field(default_factory=lambda: os.getenv("EMBEDDING_CACHE_DIR", ""))
+    # Max vectors kept in the on-disk embedding cache; the oldest are evicted beyond this
+    EMBEDDING_CACHE_MAX_ROWS: int = field(default_factory=lambda: int(os.getenv("EMBEDDING_CACHE_MAX_ROWS", "500000")))
 
 
 settings = Settings()
@@ -24,6 +24,7 @@ load_dotenv()
 sys.path.insert(0, str(Path(__file__).parent))
 
 from rag.prompts import _DEFAULT_SYSTEM_PROMPT, _DEFAULT_VECTOR_DB_RETREIVAL_PROMPT
+from rag.dynamodb_prompts import with_template_kind
 
 # Configure logging
 logging.basicConfig(
@@ -91,7 +92,7 @@ def migrate_prompt(template_name: str, template_body: str, edited_by: str, dry_r
     if not dry_run:
         try:
             table = dynamodb.Table(TABLE_NAME)
-            table.put_item(Item=item)
+            table.put_item(Item=with_template_kind(item))
             logger.info(f"✓ Successfully migrated '{template_name}'")
         except Exception as e:
             logger.error(f"✗ Error migrating '{template_name}': {e}")
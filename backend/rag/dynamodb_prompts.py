@@ -9,22 +9,30 @@ Items structure:
 - edited_at_iso (Number): Timestamp for version tracking
 - edited_by_sub: User ID who edited
 - template_body: The actual prompt text
+- template_kind: 'asset_template' on asset_template_* items only (partition key of the
+  asset_kind_idx GSI, sort key template_name)
 """
 
-import boto3
+from boto3.dynamodb.types import TypeDeserializer
 from typing import Optional, Dict, Any
 import logging
 from decimal import Decimal
-import os
 
-logger = logging.getLogger(__name__)
+# AWS_REGION is re-exported for callers that import it from here
+from _aws import AWS_REGION, BOTO_CONFIG, SESSION
 
-# Get AWS region from environment or use default
-AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
+logger = logging.getLogger(__name__)
 
-# Initialize DynamoDB resource with region
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# Initialize DynamoDB from the shared session and botocore config (pool size, retries)
+dynamodb = SESSION.resource('dynamodb', config=BOTO_CONFIG)
 prompts_table = dynamodb.Table('prompts_templates_tbl')
+# Low-level client for template reads: unlike the resource above it is thread-safe,
+# so get_latest_prompt_template can run from worker threads
+dynamodb_client = SESSION.client('dynamodb', config=BOTO_CONFIG)
+_deserializer = TypeDeserializer()
+
+ASSET_TEMPLATE_PREFIX = 'asset_template_'
+ASSET_TEMPLATE_KIND = 'asset_template'
 
 
 def _convert_decimal(obj):
@@ -34,6 +42,16 @@ def _convert_decimal(obj):
     return obj
 
 
+def with_template_kind(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tag asset template items with template_kind (in place) so the asset_kind_idx GSI picks them up.
+    Every writer of prompts_templates_tbl should pass its items through this.
+    """
+    if item.get('template_name', '').startswith(ASSET_TEMPLATE_PREFIX):
+        item['template_kind'] = ASSET_TEMPLATE_KIND
+    return item
+
+
 def get_latest_prompt_template(template_name: str) -> Optional[Dict[str, Any]]:
     """
     Retrieve the latest version of a prompt template from DynamoDB.
@@ -48,9 +66,14 @@ def get_latest_prompt_template(template_name: str) -> Optional[Dict[str, Any]]:
     try:
         logger.info(f"Retrieving prompt template: {template_name}")
         
-        # Query all items with this template_name
-        response = prompts_table.query(
-            KeyConditionExpression=boto3.dynamodb.conditions.Key('template_name').eq(template_name)
+        # edited_at_iso is the sort key - newest version first, and only that one
+        response = dynamodb_client.query(
+            TableName='prompts_templates_tbl',
+            KeyConditionExpression='template_name = :n',
+            ExpressionAttributeValues={':n': {'S': template_name}},
+            ProjectionExpression='template_body, edited_at_iso, edited_by_sub',
+            ScanIndexForward=False,
+            Limit=1
         )
         
         items = response.get('Items', [])
@@ -59,8 +82,7 @@ def get_latest_prompt_template(template_name: str) -> Optional[Dict[str, Any]]:
             logger.warning(f"No template found with name: {template_name}")
             return None
         
-        # Sort by edited_at_iso to get the latest
-        latest_item = max(items, key=lambda x: _convert_decimal(x.get('edited_at_iso', 0)))
+        latest_item = {name: _deserializer.deserialize(value) for name, value in items[0].items()}
         
         result = {
             'template_body': latest_item.get('template_body', ''),
@@ -0,0 +1,155 @@
+"""
+Embedding cache for query and document vectors.
+
+Two layers, both keyed by (model name, blake2b hash of the text):
+- In-process LRU for hot entries, stored as float32 arrays (~4 bytes per dimension)
+- Optional SQLite file on disk so document vectors survive restarts and re-ingests;
+  capped at max_rows, evicting the oldest writes. Writes opt out with persist=False
+  (query embeddings stay in memory so the search path never commits to disk).
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAXSIZE = 50_000
+DEFAULT_MAX_ROWS = 500_000
+# Hashes per "IN (...)" lookup, under SQLite's default host-parameter limit
+SQLITE_LOOKUP_CHUNK = 500
+
+
+def content_hash(text: str) -> str:
+    """Stable 128-bit hash of the text used as the cache key."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Thread-safe LRU + SQLite cache of embedding vectors for a single model.
+    The memory LRU and the SQLite connection have separate locks, so disk lookups and
+    writes (bulk ingests) never hold up lookups that the LRU can answer.
+    """
+
+    def __init__(self, model_name: str, cache_dir: Optional[str] = None, maxsize: int = DEFAULT_MAXSIZE, max_rows: int = DEFAULT_MAX_ROWS):
+        self._model_name = model_name
+        self._maxsize = maxsize
+        self._max_rows = max_rows
+        self._rows = 0  # upper bound on rows on disk (replacements are counted as inserts)
+        self._memory: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()  # guards _memory
+        self._db_lock = threading.Lock()  # guards _db and _rows
+        self._db: Optional[sqlite3.Connection] = None
+
+        if cache_dir:
+            try:
+                path = Path(cache_dir).expanduser()
+                path.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(path / "embeddings.sqlite3"), check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "model TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, "
+                    "PRIMARY KEY (model, hash))"
+                )
+                self._db.commit()
+                self._rows = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            except Exception as e:
+                # Fall back to memory-only caching (e.g. read-only filesystem)
+                logger.warning(f"Embedding disk cache disabled: {type(e).__name__}: {str(e)}")
+                self._db = None
+
+    def _remember(self, key: Tuple[str, str], vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self._maxsize:
+            self._memory.popitem(last=False)
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Return the cached vector for text, or None on a miss."""
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Return cached vectors aligned with texts (None for misses)."""
+        return [None if vector is None else vector.tolist() for vector in self.get_arrays(texts)]
+
+    def get_array(self, text: str) -> Optional[np.ndarray]:
+        """Like get, but returns the cached float32 array itself (treat it as read-only)."""
+        return self.get_arrays([text])[0]
+
+    def get_arrays(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        keys = [(self._model_name, content_hash(text)) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    results[i] = vector
+                else:
+                    missing.append(i)
+        if not missing or self._db is None:
+            return results
+
+        # Memory misses: chunked IN lookups on disk, outside the memory lock
+        hashes = list(dict.fromkeys(keys[i][1] for i in missing))
+        found = {}
+        with self._db_lock:
+            for start in range(0, len(hashes), SQLITE_LOOKUP_CHUNK):
+                chunk = hashes[start:start + SQLITE_LOOKUP_CHUNK]
+                found.update(self._db.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({','.join('?' * len(chunk))})",
+                    (self._model_name, *chunk)
+                ).fetchall())
+        if found:
+            with self._lock:
+                for i in missing:
+                    blob = found.get(keys[i][1])
+                    if blob is not None:
+                        vector = np.frombuffer(blob, dtype=np.float32)
+                        self._remember(keys[i], vector)
+                        results[i] = vector
+        return results
+
+    def _evict(self) -> None:
+        """Trim the disk cache back under max_rows (plus 10% headroom), oldest rows first. Call with _db_lock held."""
+        self._rows = self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        excess = self._rows - int(self._max_rows * 0.9)
+        if self._rows > self._max_rows and excess > 0:
+            # INSERT OR REPLACE assigns a fresh rowid, so the lowest rowids are the oldest writes
+            self._db.execute(
+                "DELETE FROM embeddings WHERE rowid IN (SELECT rowid FROM embeddings ORDER BY rowid LIMIT ?)",
+                (excess,)
+            )
+            self._db.commit()
+            self._rows -= excess
+            logger.debug(f"Evicted {excess} embeddings from the disk cache")
+
+    def put(self, text: str, vector: List[float], persist: bool = True) -> None:
+        self.put_many([text], [vector], persist=persist)
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[List[float]], persist: bool = True) -> None:
+        """Store vectors for texts in memory, and on disk too unless persist is False."""
+        rows = []
+        with self._lock:
+            for text, vector in zip(texts, vectors):
+                key = (self._model_name, content_hash(text))
+                vector = np.asarray(vector, dtype=np.float32)
+                self._remember(key, vector)
+                rows.append((key[0], key[1], vector.tobytes()))
+        if persist and self._db is not None and rows:
+            with self._db_lock:
+                try:
+                    self._db.executemany("INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)", rows)
+                    self._db.commit()
+                    self._rows += len(rows)
+                    if self._rows > self._max_rows:
+                        self._evict()
+                except Exception as e:
+                    logger.warning(f"Failed to persist embeddings: {type(e).__name__}: {str(e)}")
@@ -664,63 +664,27 @@ async def retrieve_rag_documents(retrieval_query: str, company_enumerations: Lis
         # retreive all documents in parallel
         import asyncio
         
-        # The search functions are synchronous, so we need to run them in threads
-        # Create tasks for each document type using asyncio.to_thread for parallel execution
-        reddit_tasks = [
+        # The search function is synchronous, so we need to run it in threads.
+        # Each chunk searches all three doc types in a single batched Qdrant request.
+        search_limits = {"reddit_post": 20, "yt_summary": 3, "podcast_summary": 3}
+        chunk_tasks = [
             asyncio.to_thread(
-                vector_store.search_reddit_posts,
-                chunk, 20, company_enumerations, collection_name, company_name
-            )
-            for chunk in retrieval_query_chunks
-        ]
-        youtube_tasks = [
-            asyncio.to_thread(
-                vector_store.search_youtube_summaries,
-                chunk, 3, company_enumerations, collection_name, company_name
-            )
-            for chunk in retrieval_query_chunks
-        ]
-        podcast_tasks = [
-            asyncio.to_thread(
-                vector_store.search_podcast_summaries,
-                chunk, 3, company_enumerations, collection_name, company_name
+                vector_store.search_all_doc_types,
+                chunk, search_limits, tuple(search_limits), company_enumerations, collection_name, company_name
             )
             for chunk in retrieval_query_chunks
         ]
         
         # Execute all tasks in parallel
-        all_tasks = reddit_tasks + youtube_tasks + podcast_tasks
-        results = await asyncio.gather(*all_tasks, return_exceptions=True)
-        
-        # Separate results by type
-        num_chunks = len(retrieval_query_chunks)
-        reddit_results = results[:num_chunks]
-        youtube_results = results[num_chunks:2*num_chunks]
-        podcast_results = results[2*num_chunks:]
-        
-        # Process reddit results
-        for result in reddit_results:
-            if isinstance(result, Exception):
-                logger.error(f"Error retrieving Reddit documents: {result}")
-                continue
-            if result:
-                reddit_docs.extend(result)
-        
-        # Process youtube results
-        for result in youtube_results:
-            if isinstance(result, Exception):
-                logger.error(f"Error retrieving YouTube documents: {result}")
-                continue
-            if result:
-                youtube_docs.extend(result)
+        results = await asyncio.gather(*chunk_tasks, return_exceptions=True)
         
-        # Process podcast results
-        for result in podcast_results:
+        for result in results:
             if isinstance(result, Exception):
-                logger.error(f"Error retrieving Podcast documents: {result}")
+                logger.error(f"Error retrieving documents: {result}")
                 continue
-            if result:
-                podcast_docs.extend(result)
+            reddit_docs.extend(result.get("reddit_post", []))
+            youtube_docs.extend(result.get("yt_summary", []))
+            podcast_docs.extend(result.get("podcast_summary", []))
         
         logger.info(f"✓ Parallel extraction completed: {len(reddit_docs)} Reddit, {len(youtube_docs)} YouTube, {len(podcast_docs)} Podcast documents")
         
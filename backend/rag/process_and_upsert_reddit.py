@@ -258,13 +258,21 @@ def convert_comments_to_detailed(post, prompt):
         logger.error(f"Error processing {post.get('id', 'unknown')}: {e}")
         return None
 
-def upsert_posts(collection_name: str, posts: List[Dict[str, Any]], text_fields: List[str]):
-    """Upsert posts to vector store, creating separate chunks for each text field."""
+def upsert_posts(collection_name: str, posts: List[Dict[str, Any]], text_fields: List[str]) -> int:
+    """
+    Upsert posts to vector store, creating separate chunks for each text field.
+    Returns the number of posts whose chunks were all upserted.
+    """
+    chunk_texts = []
+    chunk_metadatas = []
+    # (first, end) range of each post's chunks in chunk_texts
+    post_chunk_ranges = []
     
     for post in posts:
         # Skip None posts (from failed processing)
         if post is None:
             continue
+        first_chunk = len(chunk_texts)
             
         # Remove threads array and all children from post
         post.pop("threads", None)
@@ -302,8 +310,18 @@ def upsert_posts(collection_name: str, posts: List[Dict[str, Any]], text_fields:
                 chunk_metadata["post_id"] = original_post_id  # Add post_id for indexing to prevent duplicates
                 chunk_metadata["id"] = chunk_uuid  # Use UUID for Qdrant point ID
                 
-                logger.debug(f"Upserting chunk {chunk_idx} from field '{text_field}' of post {original_post_id} with UUID {chunk_uuid}")
-                vector_store.upsert_document(collection_name=collection_name, text=chunk_text, metadata=chunk_metadata)
+                logger.debug(f"Queueing chunk {chunk_idx} from field '{text_field}' of post {original_post_id} with UUID {chunk_uuid}")
+                chunk_texts.append(chunk_text)
+                chunk_metadatas.append(chunk_metadata)
+        if len(chunk_texts) > first_chunk:
+            post_chunk_ranges.append((first_chunk, len(chunk_texts)))
+
+    # Embed and upsert all chunks in batches rather than one request per chunk;
+    # a failed batch only loses its own chunks, and a post counts once none of its chunks failed
+    failed_chunks = set(vector_store.upsert_documents_bulk(collection_name=collection_name, texts=chunk_texts, metadatas=chunk_metadatas))
+    if failed_chunks:
+        logger.error(f"{len(failed_chunks)}/{len(chunk_texts)} chunks not upserted to {collection_name}")
+    return sum(1 for first, end in post_chunk_ranges if failed_chunks.isdisjoint(range(first, end)))
 
 
 def process_and_upsert_reddit(
@@ -336,7 +354,5 @@ def process_and_upsert_reddit(
        
         reddit_text_fields = ["title","selftext","detailed_description", "discussion_description", "summary"]
 
-    upsert_posts(collection_name, detailed_posts, reddit_text_fields)
-
-    return len(detailed_posts)
+    return upsert_posts(collection_name, detailed_posts, reddit_text_fields)
 
@@ -0,0 +1,102 @@
+"""
+Semantic cache for search results.
+
+Entries are looked up by embedding similarity rather than exact query text: a new query
+whose vector is within `threshold` cosine similarity of a cached query (with the same
+search key, e.g. collection/k/filters) reuses that query's documents.
+Entries expire after `ttl` seconds; call clear() when the underlying data changes.
+"""
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Sequence, Set
+
+import numpy as np
+from langchain_core.documents import Document
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vector: Sequence[float]) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+class SemanticCache:
+    """
+    Thread-safe LRU of (key, query vector) -> documents, matched by cosine similarity.
+    Vectors live in one preallocated (maxsize, dim) matrix whose rows are overwritten in place;
+    hits and evictions only touch the recency order and the per-key row sets, never the matrix.
+    """
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.97, ttl: float = 600.0):
+        self._maxsize = maxsize
+        self._threshold = threshold
+        self._ttl = ttl
+        self._vecs: Optional[np.ndarray] = None  # shape (maxsize, dim), float32, unit rows; allocated on first put
+        self._times = np.zeros(maxsize, dtype=np.float64)  # monotonic insert time per row
+        self._docs: List[Optional[List[Document]]] = [None] * maxsize
+        self._lru: "OrderedDict[int, Hashable]" = OrderedDict()  # row -> key, least recently used first
+        self._rows_by_key: Dict[Hashable, Set[int]] = {}
+        self._free = list(range(maxsize - 1, -1, -1))
+        self._lock = threading.Lock()
+
+    def _release(self, row: int) -> None:
+        key = self._lru.pop(row)
+        rows = self._rows_by_key[key]
+        rows.discard(row)
+        if not rows:
+            del self._rows_by_key[key]
+        self._docs[row] = None
+        self._free.append(row)
+
+    def get(self, key: Hashable, vector: Sequence[float]) -> Optional[List[Document]]:
+        """Documents cached for the most similar query with the same key, or None if none is close enough."""
+        q = _normalize(vector)
+        with self._lock:
+            rows = self._rows_by_key.get(key)
+            if not rows:
+                return None
+            rows = np.fromiter(rows, dtype=np.intp, count=len(rows))
+            sims = self._vecs[rows] @ q
+            sims[time.monotonic() - self._times[rows] > self._ttl] = -np.inf
+            best = int(np.argmax(sims))
+            if sims[best] < self._threshold:
+                return None
+            row = int(rows[best])
+            self._lru.move_to_end(row)
+            docs = self._docs[row]
+        logger.debug("Semantic cache hit (similarity %.4f)", float(sims[best]))
+        # Copy so callers can modify metadata without touching the cached entry
+        return [Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in docs]
+
+    def put(self, key: Hashable, vector: Sequence[float], docs: List[Document]) -> None:
+        cached = [Document(page_content=d.page_content, metadata=dict(d.metadata)) for d in docs]
+        vec = _normalize(vector)
+        with self._lock:
+            if self._vecs is None or self._vecs.shape[1] != vec.shape[0]:
+                self._reset(vec.shape[0])
+            if not self._free:
+                # Evict the least recently used entry (expired entries age out the same way)
+                self._release(next(iter(self._lru)))
+            row = self._free.pop()
+            self._vecs[row] = vec
+            self._times[row] = time.monotonic()
+            self._docs[row] = cached
+            self._lru[row] = key
+            self._rows_by_key.setdefault(key, set()).add(row)
+
+    def _reset(self, dim: Optional[int] = None) -> None:
+        if dim is not None:
+            self._vecs = np.zeros((self._maxsize, dim), dtype=np.float32)
+        self._docs = [None] * self._maxsize
+        self._lru.clear()
+        self._rows_by_key.clear()
+        self._free = list(range(self._maxsize - 1, -1, -1))
+
+    def clear(self) -> None:
+        """Drop every entry (e.g. after documents were re-ingested)."""
+        with self._lock:
+            self._reset()
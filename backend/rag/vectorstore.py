@@ -1,29 +1,216 @@
 from langchain_community.vectorstores import Qdrant
-from qdrant_client import QdrantClient
-from typing import List
+from qdrant_client import QdrantClient, AsyncQdrantClient
+from typing import Dict, List, Optional, Set, Tuple
+from functools import cached_property, lru_cache
 from qdrant_client.models import PointStruct, VectorParams, Distance
+from qdrant_client.models import ScalarQuantization, ScalarQuantizationConfig, ScalarType, HnswConfigDiff, PayloadSchemaType
+from qdrant_client.models import SearchParams, QuantizationSearchParams, OptimizersConfigDiff
 from langchain_core.documents import Document
+from langchain_core.vectorstores import VectorStoreRetriever
 from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
-from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, Prefetch
+from qdrant_client.models import Filter, FieldCondition, MatchValue, MatchAny, Prefetch, QueryRequest, PayloadSelectorInclude
 from core.config import settings
 import uuid
+import hashlib
 import logging
-import types
+import asyncio
+import random
+import threading
+import httpx
+from collections import OrderedDict
+import time
 import nltk
 import re
 from langchain_text_splitters import (RecursiveCharacterTextSplitter, CharacterTextSplitter)
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, InternalServerError
 import os
 from dotenv import load_dotenv
 import json
+import base64
+import numpy as np
 from rag.s3_utils import get_company_data_manager
+from rag.embedding_cache import EmbeddingCache
+from rag.semantic_cache import SemanticCache
 load_dotenv()
 
+logger = logging.getLogger(__name__)
 
-nltk.download('punkt')
+# Set once the NLTK punkt tokenizer is known to be available (downloaded on first use)
+_PUNKT_READY = False
+
+# Sentence boundary for chunking_naive: ., ! or ? followed by whitespace
+_SENT_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+# Number of texts sent per embeddings request (fits DeepInfra/OpenAI token limits)
+EMBED_BATCH_SIZE = 96
+# Max embedding batches in flight at once during bulk ingest
+EMBED_MAX_IN_FLIGHT = 5
+EMBED_MAX_RETRIES = 5
+# Points per upsert request (keeps gRPC messages well under the size limit)
+UPSERT_BATCH_SIZE = 256
+# Seconds a cached get_collections() listing stays valid
+COLLECTIONS_CACHE_TTL = 30.0
+# Seconds a semantic search-cache entry stays valid (ingests also clear the cache)
+SEARCH_CACHE_TTL = 600.0
+# Exact-match query string -> vector entries kept for local (fastembed) query embeddings
+QUERY_VECTOR_CACHE_SIZE = 2048
+
+# HNSW graph settings for user collections, applied at creation and after bulk ingest
+HNSW_M = 16
+HNSW_EF_CONSTRUCT = 200
+HNSW_SEARCH_EF = 128
+# Qdrant's default indexing threshold (KB of vectors before a segment gets an HNSW index)
+INDEXING_THRESHOLD = 20000
+
+# Keyword payload indexes for fields used in summary-collection search filters
+SUMMARY_INDEX_FIELDS = (
+    "doc_type", "domain", "operational_surface", "execution_surface",
+    "security_control_surface", "failure_type", "subreddit",
+)
+# Indexes on user document collections (LangChain stores metadata under "metadata.")
+USER_INDEX_FIELDS = {
+    "metadata.user_id": PayloadSchemaType.INTEGER,
+    "metadata.file_id": PayloadSchemaType.INTEGER,
+}
+
+# Payload keys tried in order for a search result's page_content
+TEXT_FIELDS = ("text", "content", "snippet", "citation")
+
+# Payload keys copied as-is into Document metadata, per doc_type
+FIELD_MAPS: Dict[str, Tuple[str, ...]] = {
+    "reddit_post": (
+        "title", "citation", "detailed_description", "selftext", "summary",
+        "key_issues", "pain_phrases", "emotional_triggers", "buyer_language", "implicit_risks",
+        "thread_author", "subreddit", "citation_start_time", "icp_role_type",
+        "ups", "tone", "classification", "date_created_utc", "flair_text",
+    ),
+    "yt_summary": (
+        "citation", "citation_start_time", "icp_role_type", "title", "channel", "type",
+        "key_issues", "pain_phrases", "emotional_triggers", "implicit_risks", "buyer_language",
+        "video_url", "description", "detailed_description",
+    ),
+    "podcast_summary": (
+        "citation", "citation_start_time", "icp_role_type", "title", "channel", "type",
+        "key_issues", "pain_phrases", "emotional_triggers", "implicit_risks", "buyer_language",
+        "episode_url", "episode_number", "detailed_description",
+    ),
+}
+
+# Metadata keys filled from the first non-empty of several payload keys, per doc_type
+FIELD_FALLBACKS: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "reddit_post": {"url": ("thread_url",), "post_id": ("post_id", "id")},  # post_id is used for duplicate filtering
+    "yt_summary": {"url": ("video_url",)},
+    "podcast_summary": {"mp3_url": ("mp3_url", "mp3_link")},
+}
+
+TITLE_PREFIX: Dict[str, str] = {
+    "reddit_post": "Reddit Post: ",
+    "yt_summary": "YouTube Summary: ",
+    "podcast_summary": "Podcast Summary: ",
+}
+
+
+def _payload_fields(doc_type: str) -> Tuple[str, ...]:
+    """Every payload key _points_to_documents reads for doc_type."""
+    keys = list(TEXT_FIELDS) + list(FIELD_MAPS[doc_type])
+    for payload_keys in FIELD_FALLBACKS[doc_type].values():
+        keys.extend(payload_keys)
+    return tuple(dict.fromkeys(keys))
+
+
+# Payload keys requested from Qdrant per doc_type, so large unused fields are not transferred
+REDDIT_FIELDS = _payload_fields("reddit_post")
+YT_FIELDS = _payload_fields("yt_summary")
+PODCAST_FIELDS = _payload_fields("podcast_summary")
+PAYLOAD_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "reddit_post": REDDIT_FIELDS,
+    "yt_summary": YT_FIELDS,
+    "podcast_summary": PODCAST_FIELDS,
+}
+
+
+_NAMESPACE_URL_BYTES = uuid.NAMESPACE_URL.bytes
+
+# Marks VectorStore._embeddings as not yet initialized (None means initialization failed)
+_EMBED_SENTINEL = object()
+
+
+@lru_cache(maxsize=100_000)
+def _uuid5_url(name: str) -> str:
+    """Same string as str(uuid.uuid5(uuid.NAMESPACE_URL, name)), without building a UUID object."""
+    digest = bytearray(hashlib.sha1(_NAMESPACE_URL_BYTES + name.encode("utf-8")).digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50  # version 5
+    digest[8] = (digest[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = digest.hex()
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
+
+
+def _first_of(payload: dict, keys: Tuple[str, ...]):
+    """Equivalent of payload.get(keys[0]) or payload.get(keys[1]) or ..."""
+    get = payload.get
+    value = None
+    for key in keys:
+        value = get(key)
+        if value:
+            break
+    return value
+
+
+def _point_to_doc(point, doc_type: str) -> Document:
+    """Convert one Qdrant point to a LangChain Document using FIELD_MAPS / FIELD_FALLBACKS."""
+    payload = point.payload or {}
+    get = payload.get
+    # Use None instead of "Unknown" for optional fields
+    metadata = {key: get(key) for key in FIELD_MAPS[doc_type]}
+    for key, payload_keys in FIELD_FALLBACKS[doc_type].items():
+        metadata[key] = _first_of(payload, payload_keys)
+    metadata.update(
+        doc_type=doc_type,
+        score=point.score,  # Similarity score from Qdrant
+        filename=f"{TITLE_PREFIX[doc_type]}{get('title', 'Untitled')}",
+    )
+    return Document(page_content=_first_of(payload, TEXT_FIELDS) or "", metadata=metadata)
+
+
+class _CompatQdrantClient(QdrantClient):
+    """
+    Backwards-compatibility shim: some LangChain Qdrant versions expect
+    QdrantClient.search(), which was removed in newer qdrant-client
+    versions in favor of query_points(). Defining it on a subclass keeps
+    retrievers working without pinning an old client version.
+    """
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector,
+        query_filter=None,
+        limit: int = 10,
+        with_payload: bool = True,
+        **kwargs,
+    ):
+        """
+        Adapt the old `search(...)` call signature to `query_points(...)` and
+        always return a list of ScoredPoint objects (each having `.payload`,
+        `.id`, `.score`, …), as older LangChain QdrantVectorStore expects.
+        """
+        res = self.query_points(
+            collection_name=collection_name,
+            query=query_vector,
+            query_filter=query_filter,
+            limit=limit,
+            with_payload=with_payload,
+            **kwargs,
+        )
+        # qdrant-client>=1.0 returns a response object with `.points`
+        if hasattr(res, "points") and isinstance(res.points, list):
+            return res.points
+        # Some client versions may already return a list/tuple of points
+        if isinstance(res, (list, tuple)):
+            return list(res)
+        return res
 
-logger = logging.getLogger(__name__)
 
 class VectorStore:
     def __init__(self):
@@ -31,68 +218,178 @@ class VectorStore:
         # Vector size: 1536 dimensions
         self._model_name = "BAAI/bge-base-en-v1.5"
         self._vector_size = 768
-        self._embeddings = None
+        self._embeddings = _EMBED_SENTINEL
         self._openai_api_key = settings.DEEPINFRA_API_KEY
         self._openai_base_url = settings.DEEPINFRA_API_BASE_URL
+        self._embedding_cache = EmbeddingCache(self._model_name, settings.EMBEDDING_CACHE_DIR, max_rows=settings.EMBEDDING_CACHE_MAX_ROWS)
+        # Shared embeddings client so query embeddings reuse pooled keep-alive connections
+        self._openai_client = OpenAI(
+            api_key=self._openai_api_key,
+            base_url=self._openai_base_url,
+            http_client=httpx.Client(limits=httpx.Limits(max_keepalive_connections=20)),
+        )
+        # Query string -> local fastembed embedding (see _embed_q32); remote ones use _embedding_cache
+        self._qvec_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._qvec_lock = threading.Lock()
+        # Per-doc-type search results keyed by query-embedding similarity (see search_all_doc_types)
+        self._search_cache = SemanticCache(maxsize=1024, threshold=0.97, ttl=SEARCH_CACHE_TTL)
+        self._local_embedder = None
+        self._local_embedder_failed = False
+        self._local_embedder_lock = threading.Lock()
         
         # Single Qdrant client (cloud) for both user documents and summaries
         # Configure with increased timeout for operations that may take longer
-        self.client = QdrantClient(
+        self.client = _CompatQdrantClient(
             url=settings.QDRANT_URL,
             api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None,
             timeout=300.0,  # 5 minutes timeout for operations
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+        )
+        # (fetched_at, collection names) from the last get_collections() call
+        self._collections_cache: Optional[Tuple[float, Set[str]]] = None
+        # Collections confirmed to exist; skips the existence round trip on every upload
+        self._existing_collections: Set[str] = set()
+        # LangChain Qdrant wrappers by collection name (see _get_wrapper)
+        self._wrappers: Dict[str, Qdrant] = {}
+        # Retrievers by (collection name, k) (see get_retriever)
+        self._retrievers: Dict[Tuple[str, int], VectorStoreRetriever] = {}
+        # Collections whose filter payload indexes were already requested by this process
+        self._indexed_collections: Set[str] = set()
+        self._index_lock = threading.Lock()
+    
+    @cached_property
+    def async_client(self) -> AsyncQdrantClient:
+        """Async twin of self.client for use from async code (see aadd_documents), created on first use."""
+        return AsyncQdrantClient(
+            url=settings.QDRANT_URL,
+            api_key=settings.QDRANT_API_KEY if settings.QDRANT_API_KEY else None,
+            timeout=300.0,
+            prefer_grpc=settings.QDRANT_PREFER_GRPC,
+            grpc_port=settings.QDRANT_GRPC_PORT,
         )
 
-        # Backwards-compatibility shim: some LangChain Qdrant versions expect
-        # QdrantClient.search(), which was removed in newer qdrant-client
-        # versions in favor of query_points(). We provide a thin wrapper so
-        # retrievers work without pinning an old client version.
-        if not hasattr(self.client, "search"):
-            def _search(  # type: ignore[override]
-                client_self,
-                collection_name: str,
-                query_vector,
-                query_filter=None,
-                limit: int = 10,
-                with_payload: bool = True,
-                **kwargs,
-            ):
-                """
-                Compatibility wrapper for older LangChain QdrantVectorStore, which
-                expects `QdrantClient.search(...)` to exist and return an iterable
-                of ScoredPoint objects (each having `.payload`, `.id`, `.score`, …).
-
-                Newer `qdrant-client` versions removed `.search` in favor of
-                `.query_points`, which returns a `ScoredPoint` collection object
-                with a `.points` list. This shim adapts the old call signature to
-                the new client API and always returns a list of points.
-                """
-                res = client_self.query_points(
+    def str_to_qdrant_id(self, str_id: str) -> str:
+        return _uuid5_url(str_id.strip().lower())
+
+    def _known_collections(self, ttl: float = COLLECTIONS_CACHE_TTL) -> Set[str]:
+        """Names of existing collections, refreshed from Qdrant only when the cached listing is older than ttl."""
+        cached = self._collections_cache
+        now = time.monotonic()
+        if cached is None or now - cached[0] > ttl:
+            names = {c.name for c in self.client.get_collections().collections}
+            self._collections_cache = (now, names)
+            return names
+        return cached[1]
+
+    def ensure_payload_indexes(self, collection_name: str, fields=SUMMARY_INDEX_FIELDS) -> bool:
+        """
+        Create payload indexes for filtered fields once per collection per process, so Qdrant
+        applies filters during HNSW traversal instead of post-filtering. Existing indexes are a no-op.
+        fields: field names (keyword indexes) or a dict of field name -> PayloadSchemaType.
+        Runs at collection creation and from backfill_payload_indexes.py, never on the search path.
+        The index builds are requested with wait=False; returns False if any request failed
+        (the collection is then not marked, so a later call retries it).
+        """
+        if not collection_name:
+            return False
+        with self._index_lock:
+            if collection_name in self._indexed_collections:
+                return True
+            # Claim it so concurrent callers don't repeat the requests; released again on failure
+            self._indexed_collections.add(collection_name)
+        schemas = fields if isinstance(fields, dict) else dict.fromkeys(fields, PayloadSchemaType.KEYWORD)
+        failed = False
+        for field_name, field_schema in schemas.items():
+            try:
+                self.client.create_payload_index(
                     collection_name=collection_name,
-                    query=query_vector,
-                    query_filter=query_filter,
-                    limit=limit,
-                    with_payload=with_payload,
-                    **kwargs,
+                    field_name=field_name,
+                    field_schema=field_schema,
+                    wait=False,
                 )
-                # qdrant-client>=1.0 returns a response object with `.points`
-                if hasattr(res, "points") and isinstance(res.points, list):
-                    return res.points
-                # Some client versions may already return a list/tuple of points
-                if isinstance(res, (list, tuple)):
-                    return list(res)
-                return res
-
-            # Monkey‑patch client.search so that LangChain can call it
-            self.client.search = types.MethodType(_search, self.client)
-    
-    def str_to_qdrant_id(self, str_id: str) -> str:
-        return str(uuid.uuid5(uuid.NAMESPACE_URL, str_id.strip().lower()))
+            except Exception as e:
+                failed = True
+                logger.warning(f"Could not create index on '{field_name}' for {collection_name}: {e}")
+        if failed:
+            with self._index_lock:
+                self._indexed_collections.discard(collection_name)
+        return not failed
+
+    def _collection_exists(self, collection_name: str) -> bool:
+        """Existence check that trusts previously confirmed collections and asks Qdrant about one name otherwise."""
+        if collection_name in self._existing_collections:
+            return True
+        if self.client.collection_exists(collection_name):
+            self._existing_collections.add(collection_name)
+            return True
+        return False
+
+    def invalidate_collections_cache(self, collection_name: Optional[str] = None) -> None:
+        """
+        Forget the cached collection listing (call after creating or deleting collections).
+        With collection_name, also forget everything remembered about that collection
+        (confirmed existence, payload indexes, wrapper and retrievers).
+        """
+        self._collections_cache = None
+        if collection_name is None:
+            return
+        self.invalidate_search_cache()
+        self._existing_collections.discard(collection_name)
+        self._indexed_collections.discard(collection_name)
+        self._wrappers.pop(collection_name, None)
+        for key in [key for key in self._retrievers if key[0] == collection_name]:
+            self._retrievers.pop(key, None)
+
+    def invalidate_search_cache(self) -> None:
+        """Drop cached search results (call after writing to or deleting a searched collection)."""
+        self._search_cache.clear()
+
+    def _recreate_if_missing(self, error: Exception, user_id: int, collection_name: str) -> None:
+        """
+        Recovery shared by the sync and async user upserts: re-raise error unless Qdrant reported
+        the collection missing (e.g. deleted by another worker or the maintenance API); otherwise
+        drop it from the confirmed set and recreate it so the caller can retry once.
+        """
+        if "not found" not in str(error).lower():
+            raise error
+        logger.warning(f"Collection {collection_name} not found on upsert, recreating it")
+        self.invalidate_collections_cache(collection_name)
+        self.create_collection_if_not_exists(user_id)
+
+    def _upsert_user_points(self, user_id: int, collection_name: str, points: List[PointStruct], **kwargs) -> None:
+        """Upsert into a user collection, recreating it and retrying once if it is missing."""
+        try:
+            self.client.upsert(collection_name=collection_name, points=points, **kwargs)
+        except Exception as e:
+            self._recreate_if_missing(e, user_id, collection_name)
+            self.client.upsert(collection_name=collection_name, points=points, **kwargs)
+
+    async def _aupsert_user_points(self, user_id: int, collection_name: str, points: List[PointStruct], **kwargs) -> None:
+        """Async _upsert_user_points over self.async_client, with the same missing-collection retry."""
+        try:
+            await self.async_client.upsert(collection_name=collection_name, points=points, **kwargs)
+        except Exception as e:
+            await asyncio.to_thread(self._recreate_if_missing, e, user_id, collection_name)
+            await self.async_client.upsert(collection_name=collection_name, points=points, **kwargs)
+
+    def _point_id(self, raw_id) -> str:
+        """Use raw_id directly if it is already a UUID, otherwise hash it to a deterministic UUID5."""
+        point_id_str = str(raw_id)
+        try:
+            # Qdrant accepts UUID strings as point IDs
+            uuid.UUID(point_id_str)
+            return point_id_str
+        except (ValueError, AttributeError, TypeError):
+            return self.str_to_qdrant_id(point_id_str)
     
     @property
     def embeddings(self):
-        """Lazy-load OpenAI embeddings for both user documents and cloud collections (LangChain compatible)."""
-        if self._embeddings is None:
+        """
+        Lazy-load OpenAI embeddings for both user documents and cloud collections (LangChain compatible).
+        Initialization is attempted once; after a failure this keeps returning None.
+        """
+        if self._embeddings is _EMBED_SENTINEL:
             try:
                 #logger.info(f"Creating OpenAI embeddings with model {self._model_name} ({self._vector_size}D)...")
                 #logger.info(f">>>>>>>>>>>>>_openai_api_key {self._openai_api_key}")
@@ -101,7 +398,8 @@ class VectorStore:
                 self._embeddings = OpenAIEmbeddings(
                     model=self._model_name,
                     openai_api_key=self._openai_api_key,
-                    base_url=self._openai_base_url
+                    base_url=self._openai_base_url,
+                    chunk_size=EMBED_BATCH_SIZE,
                 )
                 #logger.info(f"✓ OpenAI embeddings initialized: {self._vector_size}D")
             except Exception as e:
@@ -109,33 +407,158 @@ class VectorStore:
                 self._embeddings = None
         return self._embeddings
 
+    @property
+    def local_embedder(self):
+        """Lazy-load the shared fastembed (ONNX) model for query embeddings; None if unavailable."""
+        if self._local_embedder is None and not self._local_embedder_failed:
+            with self._local_embedder_lock:
+                if self._local_embedder is None and not self._local_embedder_failed:
+                    try:
+                        from fastembed import TextEmbedding
+                        self._local_embedder = TextEmbedding(self._model_name)
+                        logger.info(f"✓ Local fastembed model loaded: {self._model_name}")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to load local embedder, using remote embeddings: {type(e).__name__}: {str(e)}")
+                        self._local_embedder_failed = True
+        return self._local_embedder
+
+    def embed_query_vector(self, query: str) -> List[float]:
+        """
+        Embed a search query, locally when USE_LOCAL_EMBED is set, otherwise via the cached remote path.
+        Repeated identical queries (e.g. templated battle-card prompts) are served from an in-memory LRU:
+        _qvec_cache for local vectors, the embedding cache's memory layer for remote ones.
+        """
+        return self._embed_q32(query).tolist()
+
+    def _embed_q32(self, query: str) -> np.ndarray:
+        """embed_query_vector as a contiguous float32 array (cached entries are kept in this form)."""
+        if not (settings.USE_LOCAL_EMBED and self.local_embedder is not None):
+            # Already LRU-cached in memory by _embedding_cache; don't keep a second copy here
+            return self._cached_embed_q32(query)
+        with self._qvec_lock:
+            vector = self._qvec_cache.get(query)
+            if vector is not None:
+                self._qvec_cache.move_to_end(query)
+                return vector
+        vector = np.asarray(next(iter(self.local_embedder.embed([query]))), dtype=np.float32)
+        with self._qvec_lock:
+            self._qvec_cache[query] = vector
+            if len(self._qvec_cache) > QUERY_VECTOR_CACHE_SIZE:
+                self._qvec_cache.popitem(last=False)
+        return vector
+
+    def cached_embed(self, text: str, persist: bool = True) -> List[float]:
+        """
+        Embed a single text, reusing a cached vector when the same text was embedded before.
+        persist=False keeps a new vector in the memory cache only (no disk write).
+        """
+        return self._cached_embed_q32(text, persist=persist).tolist()
+
+    def _cached_embed_q32(self, text: str, persist: bool = False) -> np.ndarray:
+        """
+        cached_embed as a float32 array; the API returns it base64-packed, decoded in one buffer copy.
+        Defaults to memory-only caching since the query path calls it; ingests pass persist=True.
+        """
+        vector = self._embedding_cache.get_array(text)
+        if vector is None:
+            response = self._openai_client.embeddings.create(
+                input=text,
+                model=self._model_name,
+                encoding_format="base64"
+            )
+            vector = np.frombuffer(base64.b64decode(response.data[0].embedding), dtype=np.float32)
+            self._embedding_cache.put(text, vector, persist=persist)
+        return vector
+
+    async def _embed_batch_with_retry(self, client: AsyncOpenAI, batch: List[str], semaphore: asyncio.Semaphore) -> List[List[float]]:
+        """Embed one batch, retrying rate limits and transient errors with backoff (honors Retry-After)."""
+        for attempt in range(EMBED_MAX_RETRIES):
+            async with semaphore:
+                # Small jitter so concurrent batches don't hit the API in lockstep
+                await asyncio.sleep(random.uniform(0, 0.05))
+                try:
+                    response = await client.embeddings.create(input=batch, model=self._model_name)
+                    return [item.embedding for item in response.data]
+                except (RateLimitError, APIConnectionError, InternalServerError) as e:
+                    if attempt == EMBED_MAX_RETRIES - 1:
+                        raise
+                    retry_after = None
+                    if getattr(e, "response", None) is not None:
+                        retry_after = e.response.headers.get("retry-after")
+                    try:
+                        delay = float(retry_after) if retry_after else 2 ** attempt
+                    except ValueError:
+                        delay = 2 ** attempt
+                    logger.warning(f"Embedding batch failed ({type(e).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{EMBED_MAX_RETRIES})")
+            # Back off outside the semaphore so other batches can proceed
+            await asyncio.sleep(delay + random.uniform(0, 0.05))
+
+    async def embed_texts_concurrent(self, texts: List[str], batch_size: int = EMBED_BATCH_SIZE, max_in_flight: int = EMBED_MAX_IN_FLIGHT) -> List[Optional[List[float]]]:
+        """
+        Embed texts in batches, submitting up to max_in_flight batches concurrently.
+        Returned vectors are in the same order as the input texts. A batch that still fails
+        after its retries is logged and leaves None for its texts; the other batches go on.
+        """
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        # Retries are handled in _embed_batch_with_retry
+        client = AsyncOpenAI(api_key=self._openai_api_key, base_url=self._openai_base_url, max_retries=0)
+
+        async def _run(start: int):
+            batch_vectors = await self._embed_batch_with_retry(client, texts[start:start + batch_size], semaphore)
+            vectors[start:start + len(batch_vectors)] = batch_vectors
+
+        starts = range(0, len(texts), batch_size)
+        try:
+            results = await asyncio.gather(*[_run(start) for start in starts], return_exceptions=True)
+        finally:
+            await client.close()
+        for start, result in zip(starts, results):
+            if isinstance(result, Exception):
+                logger.error(f"✗ Embedding batch {start}-{min(start + batch_size, len(texts)) - 1} failed: {type(result).__name__}: {str(result)}")
+        return vectors
+
     def chunking(self, text, model: str = "nltk") -> List[str]:
         """Chunk the text into a list of strings."""
+        global _PUNKT_READY
         if model == "nltk":
             try:
+                if not _PUNKT_READY:
+                    try:
+                        nltk.data.find("tokenizers/punkt")
+                    except LookupError:
+                        nltk.download("punkt", quiet=True)
+                    _PUNKT_READY = True
                 return nltk.sent_tokenize(text)
             except Exception as e:
                 logger.error(f"❌ Error chunking text: {e}")
             return [text]
         return [text]
 
-    def chunking_langchain(self, text: str,recursive_splitter = False) -> List[str]:
+    def chunking_langchain(self, text: str, recursive_splitter = False, chunk_size: int = 1000, overlap: int = 200) -> List[str]:
         """
         Chunk the text into smaller pieces for retrieval using LangChain.
+        Uses a sliding window (chunk_size / overlap); the recursive splitter breaks on
+        paragraphs, lines, sentences, then words so chunks don't end mid-word.
         """
         try:
             if not text:
                 return []
+            # Short text fits in a single chunk, skip the splitter
+            if len(text) <= chunk_size:
+                stripped = text.strip()
+                return [stripped] if stripped else []
             if recursive_splitter:
                 text_splitter = RecursiveCharacterTextSplitter(
-                    chunk_size=1000,
-                    chunk_overlap=0,
+                    chunk_size=chunk_size,
+                    chunk_overlap=overlap,
                     length_function=len,
+                    separators=["\n\n", "\n", ". ", " "],
                 )
             else:
                 text_splitter = CharacterTextSplitter(
-                    chunk_size=1000,
-                    chunk_overlap=0,
+                    chunk_size=chunk_size,
+                    chunk_overlap=overlap,
                     length_function=len,
                 )
             chunks = text_splitter.split_text(text)
@@ -153,7 +576,7 @@ class VectorStore:
         try:
             if not text:
                 return []
-            chunks = re.split(r'(?<=[.!?])\s+', text)
+            chunks = _SENT_SPLIT.split(text)
             return [c.strip() for c in chunks if c.strip()]
         except Exception as e:
             logger.error(f"Error chunking text: {e}", exc_info=True)
@@ -200,8 +623,7 @@ class VectorStore:
         
         try:
             # Get all existing collections from Qdrant
-            collections = self.client.get_collections().collections
-            existing_collection_names = [c.name for c in collections]
+            existing_collection_names = self._known_collections()
             logger.debug(f"Found {len(existing_collection_names)} existing collections in Qdrant")
             
 
@@ -214,7 +636,7 @@ class VectorStore:
             # No match found - return the most common format as fallback
             fallback = f"{domain.lower().replace(' ', '_').replace('-', '_')}-{suffix}"
             logger.warning(f"No matching collection found for domain '{domain}'. Using fallback: '{fallback}'")
-            logger.debug(f"Available collections: {existing_collection_names[:10]}")
+            logger.debug(f"Available collections: {sorted(existing_collection_names)[:10]}")
             return fallback
             
         except Exception as e:
@@ -258,24 +680,65 @@ class VectorStore:
         
         return unique_variations
     
-    def create_collection_if_not_exists(self, user_id: int, vector_size: int = None):
-        """Create a Qdrant collection for a user if it doesn't exist."""
+    def create_collection_if_not_exists(self, user_id: int, vector_size: int = None, pause_indexing: bool = False) -> bool:
+        """
+        Create a Qdrant collection for a user if it doesn't exist. Returns True if this call created it.
+        With pause_indexing=True a new collection starts without HNSW graph building (m=0,
+        indexing_threshold=0) for its initial upload; call _resume_indexing once that is done.
+        Existing collections are never changed.
+        """
         if vector_size is None:
             vector_size = self._vector_size  # Use the model's vector size
         collection_name = self.get_collection_name(user_id)
         try:
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-            if collection_name not in collection_names:
+            if not self._collection_exists(collection_name):
+                # Raw vectors and graph on disk; INT8 quantized copies stay in RAM for search
                 self.client.create_collection(
                     collection_name=collection_name,
-                    vectors_config={"size": vector_size, "distance": "Cosine"}
+                    vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE, on_disk=True),
+                    quantization_config=ScalarQuantization(
+                        scalar=ScalarQuantizationConfig(type=ScalarType.INT8, quantile=0.99, always_ram=True)
+                    ),
+                    hnsw_config=HnswConfigDiff(m=0 if pause_indexing else HNSW_M, ef_construct=HNSW_EF_CONSTRUCT, on_disk=True),
+                    optimizers_config=OptimizersConfigDiff(indexing_threshold=0) if pause_indexing else None,
                 )
+                self.invalidate_collections_cache()
+                self._existing_collections.add(collection_name)
+                self.ensure_payload_indexes(collection_name, USER_INDEX_FIELDS)
                 logger.info(f"Created collection {collection_name} with vector size {vector_size}")
+                return True
         except Exception as e:
             logger.error(f"Error creating collection: {e}", exc_info=True)
             # Collection might already exist, continue
+        return False
     
+    def _tag_documents(self, documents: List[Document], user_id: int, file_id: int, filename: str, file_type: str) -> None:
+        """Add ownership/source metadata to documents in place."""
+        for doc in documents:
+            doc.metadata.update({
+                "user_id": user_id,
+                "file_id": file_id,
+                "filename": filename,
+                "file_type": file_type,
+            })
+
+    def _document_points(self, documents: List[Document], vectors: List[List[float]]) -> List[PointStruct]:
+        """
+        Build points using the same payload layout as LangChain's Qdrant wrapper
+        so get_retriever() keeps working.
+        """
+        return [
+            PointStruct(
+                id=uuid.uuid4().hex,
+                vector=vector,
+                payload={
+                    Qdrant.CONTENT_KEY: doc.page_content,
+                    Qdrant.METADATA_KEY: doc.metadata,
+                }
+            )
+            for doc, vector in zip(documents, vectors)
+        ]
+
     def add_documents(
         self,
         user_id: int,
@@ -284,209 +747,241 @@ class VectorStore:
         filename: str,
         file_type: str
     ) -> None:
-        """Add documents to the user's vector store."""
+        """
+        Add documents to the user's vector store.
+        If this upload creates the collection, HNSW indexing is paused until it finishes and the
+        graph is then built once in the background; uploads into existing collections index online.
+        """
         collection_name = self.get_collection_name(user_id)
-        self.create_collection_if_not_exists(user_id)
         
         # Add metadata to documents
-        for doc in documents:
-            doc.metadata.update({
-                "user_id": user_id,
-                "file_id": file_id,
-                "filename": filename,
-                "file_type": file_type,
-            })
+        self._tag_documents(documents, user_id, file_id, filename, file_type)
         
-        # Use Qdrant vector store
-        vector_store = Qdrant(
-            client=self.client,
-            collection_name=collection_name,
-            embeddings=self.embeddings,
-        )
-        vector_store.add_documents(documents)
+        if self.embeddings is None:
+            raise RuntimeError("Embeddings not initialized")
+
+        # One embed_documents call (batched internally by chunk_size), then pipelined upserts:
+        # Qdrant applies a collection's updates in order, so the last batch waits (wait=True) until
+        # all of them were processed - "Added" is logged only then, and failures on it are raised
+        vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        points = self._document_points(documents, vectors)
+        created = self.create_collection_if_not_exists(user_id, pause_indexing=True)
+        try:
+            for start in range(0, len(points), UPSERT_BATCH_SIZE):
+                self._upsert_user_points(
+                    user_id,
+                    collection_name,
+                    points[start:start + UPSERT_BATCH_SIZE],
+                    wait=start + UPSERT_BATCH_SIZE >= len(points),
+                )
+        finally:
+            if created:
+                self._resume_indexing(collection_name)
+        logger.info(f"✓ Added {len(documents)} documents to {collection_name}")
+
+    def _resume_indexing(self, collection_name: str) -> None:
+        """Restore production HNSW settings; Qdrant builds the graph in the background."""
+        try:
+            self.client.update_collection(
+                collection_name=collection_name,
+                hnsw_config=HnswConfigDiff(m=HNSW_M, ef_construct=HNSW_EF_CONSTRUCT),
+                optimizers_config=OptimizersConfigDiff(indexing_threshold=INDEXING_THRESHOLD),
+            )
+        except Exception as e:
+            logger.error(f"Failed to restore HNSW indexing on {collection_name}: {type(e).__name__}: {str(e)}")
+
+    async def aadd_documents(
+        self,
+        user_id: int,
+        documents: List[Document],
+        file_id: int,
+        filename: str,
+        file_type: str
+    ) -> None:
+        """Async add_documents: embeds all batches concurrently (bounded), then upserts in UPSERT_BATCH_SIZE batches."""
+        collection_name = self.get_collection_name(user_id)
+
+        self._tag_documents(documents, user_id, file_id, filename, file_type)
+
+        if self.embeddings is None:
+            raise RuntimeError("Embeddings not initialized")
+
+        semaphore = asyncio.Semaphore(EMBED_MAX_IN_FLIGHT)
+
+        async def _embed(batch: List[Document]) -> List[List[float]]:
+            async with semaphore:
+                return await self.embeddings.aembed_documents([doc.page_content for doc in batch])
+
+        batches = [documents[start:start + EMBED_BATCH_SIZE] for start in range(0, len(documents), EMBED_BATCH_SIZE)]
+        batch_vectors = await asyncio.gather(*[_embed(batch) for batch in batches])
+        vectors = [vector for vectors_ in batch_vectors for vector in vectors_]
+
+        created = await asyncio.to_thread(self.create_collection_if_not_exists, user_id, pause_indexing=True)
+        try:
+            points = self._document_points(documents, vectors)
+            # Same pipelining as add_documents: only the last batch waits for the writes to be applied
+            for start in range(0, len(points), UPSERT_BATCH_SIZE):
+                await self._aupsert_user_points(
+                    user_id,
+                    collection_name,
+                    points[start:start + UPSERT_BATCH_SIZE],
+                    wait=start + UPSERT_BATCH_SIZE >= len(points),
+                )
+        finally:
+            if created:
+                await asyncio.to_thread(self._resume_indexing, collection_name)
+        logger.info(f"✓ Added {len(documents)} documents to {collection_name}")
     
     def get_retriever(self, user_id: int, k: int = 5):
-        """Get a retriever for the user's vector store."""
+        """Get a retriever for the user's vector store (built once per collection and k, then reused)."""
         collection_name = self.get_collection_name(user_id)
-        vector_store = Qdrant(
-            client=self.client,
-            collection_name=collection_name,
-            embeddings=self.embeddings,
-        )
-        return vector_store.as_retriever(search_kwargs={"k": k})
+        retriever = self._retrievers.get((collection_name, k))
+        if retriever is None:
+            # ANN over the INT8 quantized vectors, then rescore 2x oversampled candidates with the originals
+            search_params = SearchParams(
+                hnsw_ef=HNSW_SEARCH_EF,
+                quantization=QuantizationSearchParams(rescore=True, oversampling=2.0),
+            )
+            retriever = self._get_wrapper(collection_name).as_retriever(
+                search_kwargs={"k": k, "search_params": search_params}
+            )
+            self._retrievers[(collection_name, k)] = retriever
+        return retriever
+
+    def _get_wrapper(self, collection_name: str) -> Qdrant:
+        """LangChain Qdrant wrapper for a collection, created once and reused (the client is thread-safe)."""
+        wrapper = self._wrappers.get(collection_name)
+        if wrapper is None:
+            wrapper = Qdrant(
+                client=self.client,
+                collection_name=collection_name,
+                embeddings=self.embeddings,
+            )
+            self._wrappers[collection_name] = wrapper
+        return wrapper
 
 
     
-    def search_doc_type(self, query: str, k: int = 3, doc_type: str = "reddit_post", company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
-        """Search marketing summaries from the shared cloud Qdrant collection."""
+    def _doc_type_prefetch(self, query_vector: List[float], k: int, doc_type: str, company_enumerations) -> List[Prefetch]:
+        """
+        Prefetch stages for a company-filtered doc_type search.
+        Both legacy (security_control_surface) and current (execution_surface) field names are
+        searched in one request; Qdrant dedupes the union and re-scores it against the query
+        vector, so scores stay cosine similarities.
+        """
+        filters = []
+        for surface_key in ("security_control_surface", "execution_surface"):
+            filters.append(Filter(
+                must=[FieldCondition(key="doc_type", match=MatchValue(value=doc_type)),
+                    FieldCondition(key="domain", match=MatchAny(any=company_enumerations.get("domain", []))),
+                    FieldCondition(key="operational_surface", match=MatchAny(any=company_enumerations.get("operational_surface", []))),
+                    FieldCondition(key=surface_key, match=MatchAny(any=company_enumerations.get("execution_surface", []))),
+                    FieldCondition(key="failure_type", match=MatchAny(any=company_enumerations.get("failure_type", [])))
+                ]
+            ))
+        return [Prefetch(query=query_vector, filter=f, limit=k) for f in filters]
+
+    def search_doc_type(self, query: str, k: int = 3, doc_type: str = "reddit_post", company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None, payload_fields: Optional[Tuple[str, ...]] = None, query_vector: Optional[List[float]] = None) -> List[Document]:
+        """
+        Search marketing summaries from the shared cloud Qdrant collection.
+        If payload_fields is given, only those payload keys are returned; otherwise the full payload.
+        Pass query_vector to reuse an embedding the caller already computed for query.
+        """
         try:
-            logger.info(f"🔍 Searching summaries in cloud Qdrant, k={k}, doc_type={doc_type}, company_name={company_name}, collection={collection_name}")
+            logger.info("🔍 Searching summaries in cloud Qdrant, k=%s, doc_type=%s, company_name=%s, collection=%s", k, doc_type, company_name, collection_name)
 
             embeddings = self.embeddings  # OpenAI embeddings
             if embeddings is None:
                 logger.error("❌ OpenAI embeddings not initialized!")
                 return []
-            logger.info(f"Query: {query}")
+            logger.debug("Query: %s", query)
 
-            openai_client = OpenAI(api_key=settings.DEEPINFRA_API_KEY, base_url=settings.DEEPINFRA_API_BASE_URL)
-            response = openai_client.embeddings.create(
-                input=query,
-                model=self._model_name
-            )
-            query_vector = response.data[0].embedding
-            logger.info(f"###########  After reload must remove the security_control_surface from the code ###########")
-            #logger.info(f"domains: {company_enumerations.get('domain', [])}")
-            #logger.info(f"operational_surface: {company_enumerations.get('operational_surface', [])}")
-            #logger.info(f"execution_surface: {company_enumerations.get('execution_surface', [])}")
-            #logger.info(f"failure_type: {company_enumerations.get('failure_type', [])}")
-            #logger.info(f"company_name: {company_name}")
-            #logger.info(f"collection_name: {collection_name}")
-            logger.info("#########################################################################")
-
-            search_results_old = self.client.query_points(
+            if query_vector is None:
+                query_vector = self.embed_query_vector(query)
+
+            search_results = self.client.query_points(
                 collection_name=collection_name,
+                prefetch=self._doc_type_prefetch(query_vector, k, doc_type, company_enumerations),
                 query=query_vector,
                 limit=k,
-                with_payload=True,
+                with_payload=PayloadSelectorInclude(include=list(payload_fields)) if payload_fields else True,
                 with_vectors=False,
-               query_filter=Filter(
-                    must=[FieldCondition(key="doc_type", match=MatchValue(value=doc_type)),
-                        FieldCondition(key="domain", match=MatchAny(any=company_enumerations.get("domain", []))),
-                        FieldCondition(key="operational_surface", match=MatchAny(any=company_enumerations.get("operational_surface", []))),
-                        FieldCondition(key="security_control_surface", match=MatchAny(any=company_enumerations.get("execution_surface", []))),
-                        FieldCondition(key="failure_type", match=MatchAny(any=company_enumerations.get("failure_type", [])))
-                    ]
-                ),
             )
-            search_results_new = self.client.query_points(
-                collection_name=collection_name,
-                query=query_vector,
-                limit=k,
-                with_payload=True,
-                with_vectors=False,
+            sorted_points = search_results.points
 
-                query_filter=Filter(
-                    must=[FieldCondition(key="doc_type", match=MatchValue(value=doc_type)),
-                        FieldCondition(key="domain", match=MatchAny(any=company_enumerations.get("domain", []))),
-                        FieldCondition(key="operational_surface", match=MatchAny(any=company_enumerations.get("operational_surface", []))),
-                        FieldCondition(key="execution_surface", match=MatchAny(any=company_enumerations.get("execution_surface", []))),
-                        FieldCondition(key="failure_type", match=MatchAny(any=company_enumerations.get("failure_type", [])))
-                    ]
-                ),
-            )
-            
-            # Combine points from both responses, deduplicate by ID, and sort by score
-            combined_points = {}
-            for point in search_results_old.points:
-                combined_points[point.id] = point
-            for point in search_results_new.points:
-                # Keep the point with higher score if duplicate
-                if point.id not in combined_points or point.score > combined_points[point.id].score:
-                    combined_points[point.id] = point
-            
-            # Sort by score descending and limit to k
-            sorted_points = sorted(combined_points.values(), key=lambda p: p.score, reverse=True)[:k]
-            
-            logger.info(f"✓ Search completed: {len(sorted_points)} results (combined from {len(search_results_old.points)} + {len(search_results_new.points)} points)")
+            logger.info("✓ Search completed: %d results", len(sorted_points))
             return sorted_points
         except Exception as e:
             logger.error(f"❌ Error searching Documents: {type(e).__name__}: {str(e)}", exc_info=True)
             return []
             
-    def search_reddit_posts(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
-        search_results_points = self.search_doc_type(query, k, "reddit_post", company_enumerations,collection_name, company_name)
-
-        # Convert Qdrant results to LangChain Documents
-        documents = []
-        for i, point in enumerate(search_results_points, 1):
-            # Extract text from payload – prefer full text, then snippet/citation
-            payload = point.payload or {}
-            text = (payload.get("text") or payload.get("content") or payload.get("snippet") or payload.get("citation")) or ""
-            
-            doc_type = "reddit_post"
-            
-            # Get post_id from payload - try multiple possible field names
-            post_id = payload.get("post_id") or payload.get("id")
-            
-            # Build metadata with all available fields (use None instead of "Unknown" for optional fields)
-            metadata = {
-                "doc_type": doc_type,
-                "score": point.score,  # Similarity score from Qdrant
-
-                # Common fields across all document types
-                'title': payload.get("title"),
-                'citation': payload.get("citation"),
-                "detailed_description": payload.get("detailed_description"),
-                'selftext': payload.get("selftext"),
-                "summary": payload.get("summary"),
-                "key_issues": payload.get("key_issues"),
-                "pain_phrases": payload.get("pain_phrases"),
-                "emotional_triggers": payload.get("emotional_triggers"),
-                "buyer_language": payload.get("buyer_language"),
-                "implicit_risks": payload.get("implicit_risks"),
-                'url': payload.get("thread_url"),
-                'thread_author': payload.get("thread_author"),
-                'subreddit': payload.get("subreddit"),
-                'post_id': post_id,  # Add post_id for duplicate filtering
-
-                'citation_start_time': payload.get("citation_start_time"),
-                'icp_role_type': payload.get("icp_role_type"),
-                "ups": payload.get("ups"),
-                "tone": payload.get("tone"),
-                "classification": payload.get("classification"),
-                "date_created_utc": payload.get("date_created_utc"),
-                "flair_text": payload.get("flair_text"),
-            }
-            # Debug logging for post_id
-            #logger.debug(f"Reddit post {i}: post_id={post_id}, title={payload.get('title', 'N/A')[:50]}")
-
-
-            # Generate appropriate filename based on doc_type
-            filename = f"Reddit Post: {payload.get('title', 'Untitled')}"
-           
-            metadata["filename"] = filename
-
-            # Log what we extracted
-            #logger.info(f"Extracted Reddit Post metadata:  title={filename}, summary={payload.get('summary', 'Untitled')}, score={point.score}")
-
-            # Create Document
-            doc = Document(
-                page_content=text,
-                metadata=metadata
+    def search_all_doc_types(self, query: str, k=3, doc_types=("reddit_post", "yt_summary", "podcast_summary"), company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> Dict[str, List[Document]]:
+        """
+        Search several doc types for the same query in one Qdrant round trip (query_batch_points).
+        Near-duplicate queries (same collection, doc type, count and filters) are answered from the
+        semantic search cache; only the remaining doc types are sent to Qdrant.
+
+        Args:
+            k: Result count for every doc type, or a dict of doc_type -> count
+
+        Returns:
+            Dict of doc_type -> List[Document]
+        """
+        logger.info("🔍 Batch search over %s, collection=%s, company_name=%s", doc_types, collection_name, company_name)
+        query_vector32 = self._embed_q32(query)
+        query_vector = query_vector32.tolist()
+        limits = {doc_type: (k.get(doc_type, 3) if isinstance(k, dict) else k) for doc_type in doc_types}
+        filters_key = json.dumps(company_enumerations, sort_keys=True, default=str)
+        cache_keys = {doc_type: (collection_name, doc_type, limits[doc_type], filters_key) for doc_type in doc_types}
+
+        results = {}
+        for doc_type in doc_types:
+            documents = self._search_cache.get(cache_keys[doc_type], query_vector32)
+            if documents is not None:
+                logger.info("✅ Retrieved %d %s Documents from semantic cache", len(documents), doc_type)
+                results[doc_type] = documents
+        misses = [doc_type for doc_type in doc_types if doc_type not in results]
+        if not misses:
+            return results
+
+        requests = [
+            QueryRequest(
+                prefetch=self._doc_type_prefetch(query_vector, limits[doc_type], doc_type, company_enumerations),
+                query=query_vector,
+                limit=limits[doc_type],
+                with_payload=PayloadSelectorInclude(include=list(PAYLOAD_FIELDS[doc_type])),
+                with_vector=False,
             )
-            documents.append(doc)
-            
-        
-        logger.info(f"✅ Retrieved {len(documents)} Documents  successfully")
-        return documents
-        
+            for doc_type in misses
+        ]
+        responses = self.client.query_batch_points(collection_name=collection_name, requests=requests)
 
-    
-    def search_youtube_summaries(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
-        search_results_points = self.search_doc_type(query, k, "yt_summary", company_enumerations, collection_name, company_name)
+        for doc_type, response in zip(misses, responses):
+            documents = self._points_to_documents(response.points, doc_type)
+            if documents:
+                self._search_cache.put(cache_keys[doc_type], query_vector32, documents)
+            results[doc_type] = documents
+        return {doc_type: results[doc_type] for doc_type in doc_types}
 
-    def search_reddit_posts_minimal_filter(self, query: str, k: int = 10, collection_name: str = None, doc_type: str = "reddit_post") -> List[Document]:
+    def search_reddit_posts_minimal_filter(self, query: str, k: int = 10, collection_name: str = None, doc_type: str = "reddit_post", query_vector: Optional[List[float]] = None) -> List[Document]:
         """
         Search Reddit posts with minimal filtering - only doc_type filter.
         Useful for competitive intelligence and battle cards where we want broad coverage.
         No company-specific metadata filters applied.
+        Pass query_vector to reuse an embedding the caller already has.
         """
         try:
-            logger.info(f"🔍 Minimal filter search: k={k}, doc_type={doc_type}, collection={collection_name}")
+            logger.info("🔍 Minimal filter search: k=%s, doc_type=%s, collection=%s", k, doc_type, collection_name)
             
             if self.embeddings is None:
                 logger.error("❌ OpenAI embeddings not initialized!")
                 return []
             
-            logger.info(f"Query: {query[:100]}...")
+            logger.debug("Query: %s...", query[:100])
             
             # Embed the query
-            openai_client = OpenAI(api_key=settings.DEEPINFRA_API_KEY, base_url=settings.DEEPINFRA_API_BASE_URL)
-            response = openai_client.embeddings.create(
-                input=query,
-                model=self._model_name
-            )
-            query_vector = response.data[0].embedding
+            if query_vector is None:
+                query_vector = self.embed_query_vector(query)
             
             # Search with only doc_type filter (no company enumeration filters)
             search_results = self.client.query_points(
@@ -504,165 +999,66 @@ class VectorStore:
             documents = []
             for i, point in enumerate(search_results.points, 1):
                 payload = point.payload or {}
+                get = payload.get
                 
                 # Try multiple fields for text content
                 text = (
-                    payload.get("text") or 
-                    payload.get("content") or 
-                    payload.get("full_text") or
-                    payload.get("selftext") or
-                    payload.get("snippet") or 
-                    payload.get("summary") or
-                    payload.get("citation") or 
+                    get("text") or 
+                    get("content") or 
+                    get("full_text") or
+                    get("selftext") or
+                    get("snippet") or 
+                    get("summary") or
+                    get("citation") or 
                     ""
                 )
                 
                 metadata = {
                     "doc_type": doc_type,
                     "score": point.score,
-                    "title": payload.get("title"),
-                    "citation": payload.get("citation"),
-                    "url": payload.get("url"),
-                    "link": payload.get("link"),
-                    "summary": payload.get("summary"),
+                    "title": get("title"),
+                    "citation": get("citation"),
+                    "url": get("url"),
+                    "link": get("link"),
+                    "summary": get("summary"),
                     **payload  # Include all payload fields
                 }
                 
                 doc = Document(page_content=text, metadata=metadata)
                 documents.append(doc)
                 
-                # Enhanced logging
-                title_preview = metadata.get('title', 'Untitled')[:50]
-                text_length = len(text)
-                has_citation = bool(metadata.get('citation') or metadata.get('url') or metadata.get('link'))
-                logger.info(f"  {i}. {title_preview}... (score: {point.score:.4f}, text_len: {text_length}, has_link: {has_citation})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    title_preview = (metadata.get('title') or 'Untitled')[:50]
+                    has_citation = bool(metadata.get('citation') or metadata.get('url') or metadata.get('link'))
+                    logger.debug("  %d. %s... (score: %.4f, text_len: %d, has_link: %s)", i, title_preview, point.score, len(text), has_citation)
             
-            logger.info(f"✅ Retrieved {len(documents)} documents with minimal filter")
+            logger.info("✅ Retrieved %d documents with minimal filter", len(documents))
             return documents
             
         except Exception as e:
             logger.error(f"❌ Error in minimal filter search: {type(e).__name__}: {str(e)}", exc_info=True)
             return []
 
-    def search_youtube_summaries(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
-        search_results_points = self.search_doc_type(query, k, "yt_summary", company_enumerations, collection_name, company_name)
+    def _points_to_documents(self, points, doc_type: str) -> List[Document]:
+        """Convert Qdrant points of one doc_type to LangChain Documents."""
+        return [_point_to_doc(point, doc_type) for point in points]
 
-        # Convert Qdrant results to LangChain Documents
-        documents = []
-        for i, point in enumerate(search_results_points, 1):
-            # Log the payload to see what fields are available
-            #logger.info(f"Point {i} payload keys: {list(point.payload.keys())}")
-            
-            # Extract text from payload – prefer full text, then snippet/citation
-            payload = point.payload or {}
-            text = (payload.get("text") or payload.get("content") or payload.get("snippet") or payload.get("citation")) or ""
-            
-            doc_type = "yt_summary"
-            
-            # Build metadata with all available fields (use None instead of "Unknown" for optional fields)
-            metadata = {
-                "doc_type": doc_type,
-                "score": point.score,  # Similarity score from Qdrant
-
-                # Common fields across all document types
-                'citation': point.payload.get("citation"),
-                'citation_start_time': point.payload.get("citation_start_time"),
-                'icp_role_type': point.payload.get("icp_role_type"),
-                'title': point.payload.get("title"),
-                'channel': point.payload.get("channel"),
-                'type': point.payload.get("type"),
-                'key_issues': point.payload.get("key_issues"),
-                'pain_phrases': point.payload.get("pain_phrases"),
-                'emotional_triggers': point.payload.get("emotional_triggers"),
-                'implicit_risks': point.payload.get("implicit_risks"),
-                'buyer_language': point.payload.get("buyer_language"),
-
-                # YouTube-specific fields
-                'url': point.payload.get("video_url"),
-                'video_url': point.payload.get("video_url"),  # Also store as video_url for consistency
-                'description': point.payload.get("description"),
- 
-                'detailed_description': point.payload.get("detailed_description"),
-
-            }
-      
-            # Generate appropriate filename based on doc_type
-            filename = f"YouTube Summary: {point.payload.get('title', 'Untitled')}"
-           
-            metadata["filename"] = filename
-
-            # Log what we extracted
-            logger.debug("=================================================================================")
-            logger.debug(f"Extracted metadata:  doc_type={doc_type}, filename={filename}, score={point.score}, {point.payload.get('key_issues')}, {point.payload.get('pain_phrases')}, {point.payload.get('emotional_triggers')}, {point.payload.get('implicit_risks')}, {point.payload.get('buyer_language')}")
-            logger.debug("=================================================================================")
-
-            # Create Document
-            doc = Document(
-                page_content=text,
-                metadata=metadata
-            )
-            documents.append(doc)
-        
-        logger.info(f"✅ Retrieved {len(documents)} Documents  successfully")
+    def search_reddit_posts(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None, query_vector: Optional[List[float]] = None) -> List[Document]:
+        search_results_points = self.search_doc_type(query, k, "reddit_post", company_enumerations, collection_name, company_name, payload_fields=REDDIT_FIELDS, query_vector=query_vector)
+        documents = self._points_to_documents(search_results_points, "reddit_post")
+        logger.info("✅ Retrieved %d Documents  successfully", len(documents))
         return documents
 
-    def search_podcast_summaries(self, query: str, k: int = 3, company_enumerations: List[str] = [],collection_name: str = None, company_name: str = None) -> List[Document]:
-        search_results_points = self.search_doc_type(query, k, "podcast_summary", company_enumerations, collection_name,  company_name)
+    def search_youtube_summaries(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
+        search_results_points = self.search_doc_type(query, k, "yt_summary", company_enumerations, collection_name, company_name, payload_fields=YT_FIELDS)
+        documents = self._points_to_documents(search_results_points, "yt_summary")
+        logger.info("✅ Retrieved %d Documents  successfully", len(documents))
+        return documents
 
-        # Convert Qdrant results to LangChain Documents
-        documents = []
-        for i, point in enumerate(search_results_points, 1):
-            # Log the payload to see what fields are available
-            #logger.info(f"Point {i} payload keys: {list(point.payload.keys())}")
-            
-            # Extract text from payload – prefer full text, then snippet/citation
-            payload = point.payload or {}
-            text = (payload.get("text") or payload.get("content") or payload.get("snippet") or payload.get("citation")) or ""
-            
-            doc_type = "podcast_summary"
-            
-            # Build metadata with all available fields (use None instead of "Unknown" for optional fields)
-            metadata = {
-                "doc_type": doc_type,
-                "score": point.score,  # Similarity score from Qdrant
-
-                # Common fields across all document types
-                'citation': point.payload.get("citation"),
-                'citation_start_time': point.payload.get("citation_start_time"),
-                'icp_role_type': point.payload.get("icp_role_type"),
-                'title': point.payload.get("title"),
-                'channel': point.payload.get("channel"),
-                'type': point.payload.get("type"),
-                'key_issues': point.payload.get("key_issues"),
-                'pain_phrases': point.payload.get("pain_phrases"),
-                'emotional_triggers': point.payload.get("emotional_triggers"),
-                'implicit_risks': point.payload.get("implicit_risks"),
-                'buyer_language': point.payload.get("buyer_language"),
-                # Podcast-specific fields
-                'episode_url': point.payload.get("episode_url"),
-                'episode_number': point.payload.get("episode_number"),
-                'mp3_url': point.payload.get("mp3_url") or point.payload.get("mp3_link"),
-
-                'detailed_description': point.payload.get("detailed_description"),
-
-            }
-            
-            # Generate appropriate filename based on doc_type
-            filename = f"Podcast Summary: {point.payload.get('title', 'Untitled')}"
-        
-            metadata["filename"] = filename
-
-            # Log what we extracted
-          
-            # Create Document
-            doc = Document(
-                page_content=text,
-                metadata=metadata
-            )
-            documents.append(doc)
-            
-        
-        logger.info(f"✅ Retrieved {len(documents)} Documents  successfully")
+    def search_podcast_summaries(self, query: str, k: int = 3, company_enumerations: List[str] = [], collection_name: str = None, company_name: str = None) -> List[Document]:
+        search_results_points = self.search_doc_type(query, k, "podcast_summary", company_enumerations, collection_name, company_name, payload_fields=PODCAST_FIELDS)
+        documents = self._points_to_documents(search_results_points, "podcast_summary")
+        logger.info("✅ Retrieved %d Documents  successfully", len(documents))
         return documents
 
     def clear_user_collection(self, user_id: int) -> bool:
@@ -672,11 +1068,9 @@ class VectorStore:
             logger.info(f"Attempting to clear collection: {collection_name}")
             
             # Check if collection exists
-            collections = self.client.get_collections().collections
-            collection_names = [c.name for c in collections]
-            
-            if collection_name in collection_names:
+            if self._collection_exists(collection_name):
                 self.client.delete_collection(collection_name=collection_name)
+                self.invalidate_collections_cache(collection_name)
                 logger.info(f"✓ Cleared collection: {collection_name}")
                 return True
             else:
@@ -696,20 +1090,11 @@ class VectorStore:
                 logger.error("Embeddings not initialized")
                 return False
             logger.debug(f"Generating embedding for text: {text[:100]}...")
-            vector = self.embeddings.embed_query(text)
+            vector = self.cached_embed(text)
             logger.debug(f"✓ Vector generated: {len(vector)}D")
 
             # Generate unique ID
-            # If metadata["id"] is already a UUID string, use it directly; otherwise hash it
-            point_id_str = str(metadata["id"])
-            try:
-                # Try to parse as UUID to check if it's already a valid UUID
-                uuid.UUID(point_id_str)
-                # It's a valid UUID, use it directly (Qdrant accepts UUID strings)
-                point_id = point_id_str
-            except (ValueError, AttributeError, TypeError):
-                # Not a UUID, use the hash function to generate a deterministic UUID5
-                point_id = self.str_to_qdrant_id(point_id_str)
+            point_id = self._point_id(metadata["id"])
             logger.debug("✓ Point ID generated: " + str(point_id))
             # Upsert point
             self.client.upsert(
@@ -722,6 +1107,7 @@ class VectorStore:
                     )
                 ]
             )
+            self.invalidate_search_cache()
             
             logger.info(f"✓ Upserted document to {collection_name}")
             return True
@@ -730,6 +1116,66 @@ class VectorStore:
             logger.error(f"✗ Error upserting document: {type(e).__name__}: {str(e)}")
             return False
 
+    def upsert_documents_bulk(self, collection_name: str, texts: List[str], metadatas: List[dict], batch_size: int = EMBED_BATCH_SIZE) -> List[int]:
+        """
+        Upsert many documents, embedding up to batch_size texts per request instead of one request per text.
+        Runs its own event loop, so call it from a worker thread when inside async code.
+        A failed embedding or upsert batch only loses its own documents; the rest still go in.
+        Returns the indices of texts that were not upserted (empty when everything was).
+        """
+        if self.embeddings is None:
+            logger.error("Embeddings not initialized")
+            return list(range(len(texts)))
+        if not texts:
+            return []
+
+        failed: List[int] = []
+        try:
+            # Only embed texts that are not cached yet; misses go out concurrently
+            vectors = self._embedding_cache.get_many(texts)
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            if missing:
+                new_vectors = asyncio.run(self.embed_texts_concurrent([texts[i] for i in missing], batch_size=batch_size))
+                embedded = [(i, vector) for i, vector in zip(missing, new_vectors) if vector is not None]
+                self._embedding_cache.put_many([texts[i] for i, _ in embedded], [vector for _, vector in embedded])
+                for i, vector in embedded:
+                    vectors[i] = vector
+            logger.debug(f"Embedding cache: {len(texts) - len(missing)}/{len(texts)} hits")
+        except Exception as e:
+            logger.error(f"✗ Error embedding documents: {type(e).__name__}: {str(e)}")
+            return list(range(len(texts)))
+
+        ready = []
+        for i, vector in enumerate(vectors):
+            (ready if vector is not None else failed).append(i)
+
+        for start in range(0, len(ready), UPSERT_BATCH_SIZE):
+            batch = ready[start:start + UPSERT_BATCH_SIZE]
+            try:
+                self.client.upsert(
+                    collection_name=collection_name,
+                    points=[
+                        PointStruct(
+                            id=self._point_id(metadatas[i]["id"]),
+                            vector=vectors[i],
+                            payload=metadatas[i]
+                        )
+                        for i in batch
+                    ]
+                )
+                logger.debug(f"✓ Upserted batch of {len(batch)} documents to {collection_name}")
+            except Exception as e:
+                failed.extend(batch)
+                logger.error(f"✗ Error upserting batch of {len(batch)} documents to {collection_name}: {type(e).__name__}: {str(e)}")
+
+        upserted = len(texts) - len(failed)
+        if upserted:
+            self.invalidate_search_cache()
+        if failed:
+            failed.sort()
+            logger.error(f"✗ {len(failed)}/{len(texts)} documents not upserted to {collection_name} (first indices {failed[:20]})")
+        logger.info(f"✓ Upserted {upserted} documents to {collection_name}")
+        return failed
 
 vector_store = VectorStore()
 
@@ -8,28 +8,25 @@ This script creates:
 Run: python setup_battle_cards_templates.py
 """
 
-import boto3
-import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (AWS_REGION is read when _aws is imported)
 load_dotenv()
 
+from _aws import AWS_REGION, BOTO_CONFIG, SESSION
+from rag.dynamodb_prompts import with_template_kind
+
 # DynamoDB configuration
-AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
 PROMPTS_TABLE_NAME = 'prompts_templates_tbl'
 
 # Initialize DynamoDB
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+dynamodb = SESSION.resource('dynamodb', config=BOTO_CONFIG)
 table = dynamodb.Table(PROMPTS_TABLE_NAME)
 
 def create_battle_cards_rag_template():
-    """Create the battle_cards_rag_build_template"""
-    print("\n" + "="*80)
-    print("Creating: battle_cards_rag_build_template")
-    print("="*80)
-    
+    """Build the battle_cards_rag_build_template item"""
     template_body = """You are a competitive intelligence analyst creating battle card content.
 
 **Company Information:**
@@ -76,26 +73,16 @@ Analyze our company vs the competitor and provide:
 Provide a comprehensive analysis that sales teams can use to effectively position our solution against {competitor}.
 """
     
-    try:
-        table.put_item(Item={
-            'template_name': 'battle_cards_rag_build_template',
-            'edited_at_iso': int(time.time()),
-            'edited_by_sub': 'system-setup',
-            'edit_comment': 'Initial battle cards RAG build template - created by setup script',
-            'template_body': template_body
-        })
-        print("✅ Successfully created battle_cards_rag_build_template")
-        return True
-    except Exception as e:
-        print(f"❌ Error creating template: {e}")
-        return False
+    return {
+        'template_name': 'battle_cards_rag_build_template',
+        'edited_at_iso': int(time.time()),
+        'edited_by_sub': 'system-setup',
+        'edit_comment': 'Initial battle cards RAG build template - created by setup script',
+        'template_body': template_body
+    }
 
 def create_battle_cards_asset_template():
-    """Create the asset_template_battle-cards"""
-    print("\n" + "="*80)
-    print("Creating: asset_template_battle-cards")
-    print("="*80)
-    
+    """Build the asset_template_battle-cards item"""
     template_body = """Format the battle card as a clear, scannable document:
 
 # Battle Card: [Our Company] vs [Competitor]
@@ -194,18 +181,29 @@ def create_battle_cards_asset_template():
 **Prepared For:** [Target Audience]
 """
     
+    return {
+        'template_name': 'asset_template_battle-cards',
+        'edited_at_iso': int(time.time()),
+        'edited_by_sub': 'system-setup',
+        'edit_comment': 'Initial battle cards asset template - created by setup script',
+        'template_body': template_body
+    }
+
+def write_templates(items):
+    """Write all template items in one batch (BatchWriteItem, unprocessed items are retried)"""
+    print("\n" + "="*80)
+    print("Creating Templates")
+    print("="*80)
+    
     try:
-        table.put_item(Item={
-            'template_name': 'asset_template_battle-cards',
-            'edited_at_iso': int(time.time()),
-            'edited_by_sub': 'system-setup',
-            'edit_comment': 'Initial battle cards asset template - created by setup script',
-            'template_body': template_body
-        })
-        print("✅ Successfully created asset_template_battle-cards")
+        with table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=with_template_kind(item))
+        for item in items:
+            print(f"✅ Successfully created {item['template_name']}")
         return True
     except Exception as e:
-        print(f"❌ Error creating template: {e}")
+        print(f"❌ Error creating templates: {e}")
         return False
 
 def verify_templates():
@@ -219,29 +217,34 @@ def verify_templates():
         'asset_template_battle-cards'
     ]
     
+    # boto3 resources aren't thread-safe, clients are - the workers share one low-level client
+    client = SESSION.client('dynamodb', config=BOTO_CONFIG)
+    
+    def latest_version(template_name):
+        # Latest version of the template (sort key is the edit timestamp)
+        return client.query(
+            TableName=PROMPTS_TABLE_NAME,
+            KeyConditionExpression='template_name = :n',
+            ExpressionAttributeValues={':n': {'S': template_name}},
+            ProjectionExpression='edited_at_iso, edited_by_sub',
+            ScanIndexForward=False,
+            Limit=1
+        )
+    
+    # Independent queries - run them concurrently, report in order
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [(name, executor.submit(latest_version, name)) for name in templates_to_check]
+    
     all_ok = True
-    for template_name in templates_to_check:
+    for template_name, future in futures:
         try:
-            response = table.get_item(
-                Key={
-                    'template_name': template_name,
-                    'edited_at_iso': 0  # We need to query, not get_item
-                }
-            )
-            # This won't work properly - need to query instead
-            # Let's just scan for the template_name
-            from boto3.dynamodb.conditions import Key
-            response = table.query(
-                KeyConditionExpression=Key('template_name').eq(template_name),
-                ScanIndexForward=False,
-                Limit=1
-            )
+            response = future.result()
             
             if response.get('Items'):
                 item = response['Items'][0]
                 print(f"✅ {template_name}")
-                print(f"   Edited by: {item.get('edited_by_sub')}")
-                print(f"   Timestamp: {item.get('edited_at_iso')}")
+                print(f"   Edited by: {item.get('edited_by_sub', {}).get('S')}")
+                print(f"   Timestamp: {item.get('edited_at_iso', {}).get('N')}")
             else:
                 print(f"❌ {template_name} - NOT FOUND")
                 all_ok = False
@@ -260,8 +263,10 @@ def main():
     print(f"Table: {PROMPTS_TABLE_NAME}")
     
     # Create templates
-    rag_ok = create_battle_cards_rag_template()
-    asset_ok = create_battle_cards_asset_template()
+    created_ok = write_templates([
+        create_battle_cards_rag_template(),
+        create_battle_cards_asset_template(),
+    ])
     
     # Verify
     verify_ok = verify_templates()
@@ -271,7 +276,7 @@ def main():
     print("SETUP SUMMARY")
     print("="*80)
     
-    if rag_ok and asset_ok and verify_ok:
+    if created_ok and verify_ok:
         print("✅ All templates created successfully!")
         print("\nNext steps:")
         print("1. Run: python test_battle_cards.py")
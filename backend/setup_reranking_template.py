@@ -16,10 +16,10 @@ load_dotenv()
 
 def setup_reranking_template():
     """Create the reranking template in DynamoDB."""
-    import boto3
+    from _aws import BOTO_CONFIG, SESSION
+    from rag.dynamodb_prompts import with_template_kind
     from decimal import Decimal
     
-    AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
     PROMPTS_TABLE_NAME = "prompts_templates_tbl"
     
     print("=" * 80)
@@ -27,7 +27,7 @@ def setup_reranking_template():
     print("=" * 80)
     
     # Initialize DynamoDB
-    dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+    dynamodb = SESSION.resource('dynamodb', config=BOTO_CONFIG)
     table = dynamodb.Table(PROMPTS_TABLE_NAME)
     
     # Template content
@@ -115,19 +115,21 @@ Begin filtering now."""
     print(f"✓ Template length: {len(template_body)} chars")
     print(f"✓ Timestamp: {template_item['edited_at_iso']}")
     
+    # Also create battle cards specific template
+    battle_cards_template_item = {
+        'template_name': 'results_rerank_and_filter_battle_cards_template',
+        'edited_at_iso': Decimal(str(int(datetime.now().timestamp()))),
+        'edited_by_sub': 'system-setup-script',
+        'edit_comment': 'Initial setup of battle cards reranking template (same as generic for now)',
+        'template_body': template_body
+    }
+    
     try:
-        table.put_item(Item=template_item)
+        # Both items go out in a single BatchWriteItem request
+        with table.batch_writer() as batch:
+            batch.put_item(Item=with_template_kind(template_item))
+            batch.put_item(Item=with_template_kind(battle_cards_template_item))
         print("\n✅ SUCCESS! Template created in DynamoDB")
-        
-        # Also create battle cards specific template
-        battle_cards_template_item = {
-            'template_name': 'results_rerank_and_filter_battle_cards_template',
-            'edited_at_iso': Decimal(str(int(datetime.now().timestamp()))),
-            'edited_by_sub': 'system-setup-script',
-            'edit_comment': 'Initial setup of battle cards reranking template (same as generic for now)',
-            'template_body': template_body
-        }
-        table.put_item(Item=battle_cards_template_item)
         print("\n✅ SUCCESS! Battle cards template also created in DynamoDB")
         
         print("\nYou can now:")
@@ -10,10 +10,13 @@ Run: python test_battle_cards.py
 """
 
 import os
+import re
 import sys
-import boto3
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
 
 # Load environment variables
 load_dotenv()
@@ -21,36 +24,84 @@ load_dotenv()
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from rag.dynamodb_prompts import get_latest_prompt_template
-from rag.s3_utils import get_company_data_manager
+from _aws import BOTO_CONFIG, SESSION
+from rag.dynamodb_prompts import ASSET_TEMPLATE_KIND, ASSET_TEMPLATE_PREFIX
 
 # DynamoDB setup
-AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
 PROMPTS_TABLE_NAME = 'prompts_templates_tbl'
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
+# One resource/table for the whole module, from the shared session and connection pool
+_DYNAMO = SESSION.resource('dynamodb', config=BOTO_CONFIG)
+_PROMPTS_TABLE = _DYNAMO.Table(PROMPTS_TABLE_NAME)
+# Low-level client for work fanned out to threads: clients are thread-safe, resources are not
+_CLIENT = SESSION.client('dynamodb', config=BOTO_CONFIG)
+_DESERIALIZER = TypeDeserializer()
 
-def load_asset_types_from_dynamodb():
+# Asset templates also carry template_kind=ASSET_TEMPLATE_KIND, which is the partition key of this
+# GSI (sort key template_name), so they can be queried without scanning the whole table.
+# Items saved before template_kind existed are only in the index after backfill_template_kind.py
+ASSET_KIND_INDEX = 'asset_kind_idx'
+# asset_template_one_pager -> one-pager (every item matched on the prefix, so a slice strips it)
+_PREFIX_LEN = len(ASSET_TEMPLATE_PREFIX)
+_UNDERSCORE_TO_DASH = str.maketrans('_', '-')
+# Parallel scan segments for the no-index fallback; keep small, the prompts table is only a few MB
+SCAN_SEGMENTS = 4
+
+def _paginate(operation, **kwargs):
+    """Yield all items of a query/scan, following LastEvaluatedKey across 1 MB pages"""
+    while True:
+        response = operation(**kwargs)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def _parallel_scan(total_segments=SCAN_SEGMENTS, **scan_kwargs):
     """
-    Directly load asset types from DynamoDB without importing pipeline.
-    This avoids the heavy dependencies in pipeline.py
+    Paginated scan of the prompts table split into non-overlapping segments that are read
+    concurrently through the shared client. scan_kwargs use low-level (typed) attribute values;
+    items come back deserialized, like the Table resource returns them
     """
+    def scan_segment(segment):
+        return [
+            {name: _DESERIALIZER.deserialize(value) for name, value in item.items()}
+            for item in _paginate(_CLIENT.scan, TableName=PROMPTS_TABLE_NAME, Segment=segment, TotalSegments=total_segments, **scan_kwargs)
+        ]
+    
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        return [item for items in executor.map(scan_segment, range(total_segments)) for item in items]
+
+def _asset_template_items(table, projection):
+    """Asset template items via the GSI, or a filtered scan if the index does not exist yet"""
     try:
-        table = dynamodb.Table(PROMPTS_TABLE_NAME)
-        response = table.scan(
+        return list(_paginate(
+            table.query,
+            IndexName=ASSET_KIND_INDEX,
+            KeyConditionExpression=Key('template_kind').eq(ASSET_TEMPLATE_KIND) & Key('template_name').begins_with(ASSET_TEMPLATE_PREFIX),
+            ProjectionExpression=projection
+        ))
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'ValidationException':
+            raise
+        print(f"⚠️  Index {ASSET_KIND_INDEX} not available, falling back to a table scan")
+        return _parallel_scan(
             FilterExpression='begins_with(template_name, :prefix)',
-            ExpressionAttributeValues={':prefix': 'asset_template_'}
+            ExpressionAttributeValues={':prefix': {'S': ASSET_TEMPLATE_PREFIX}},
+            ProjectionExpression=projection
         )
-        
-        asset_rules = {}
-        for item in response.get('Items', []):
-            template_name = item['template_name']
-            asset_type_key = template_name.replace('asset_template_', '').replace('_', '-')
-            asset_rules[asset_type_key] = item['template_body']
-        
-        return asset_rules
+
+def load_asset_type_names():
+    """
+    Directly load the set of asset types from DynamoDB without importing pipeline.
+    This avoids the heavy dependencies in pipeline.py; template bodies are not read at all
+    """
+    try:
+        return {
+            item['template_name'][_PREFIX_LEN:].translate(_UNDERSCORE_TO_DASH)
+            for item in _asset_template_items(_PROMPTS_TABLE, 'template_name')
+        }
     except Exception as e:
         print(f"Error loading asset types: {e}")
-        return {}
+        return set()
 
 def test_asset_types():
     """Test loading asset types from DynamoDB"""
@@ -59,18 +110,19 @@ def test_asset_types():
     print("="*80)
     
     try:
-        asset_rules = load_asset_types_from_dynamodb()
+        # Only the names are checked here - skip the template bodies
+        asset_types = load_asset_type_names()
         
-        if not asset_rules:
+        if not asset_types:
             print("❌ No asset types found in DynamoDB")
             return False
         
-        print(f"✅ Loaded {len(asset_rules)} asset types from DynamoDB:")
-        for asset_type in sorted(asset_rules.keys()):
+        print(f"✅ Loaded {len(asset_types)} asset types from DynamoDB:")
+        for asset_type in sorted(asset_types):
             print(f"   - {asset_type}")
         
         # Check for battle-cards specifically
-        if 'battle-cards' in asset_rules:
+        if 'battle-cards' in asset_types:
             print("\n✅ Battle-cards asset type found")
         else:
             print("\n⚠️  Battle-cards asset type NOT found")
@@ -81,12 +133,18 @@ def test_asset_types():
         print(f"❌ Error loading asset types: {e}")
         return False
 
+# Placeholders the battle cards RAG build template must contain
+EXPECTED_PLACEHOLDERS = ('competitor', 'company_name', 'icp')
+_PLACEHOLDER_RE = re.compile(r'\{(' + '|'.join(map(re.escape, EXPECTED_PLACEHOLDERS)) + r')\}')
+
 def test_battle_cards_template():
     """Test that battle cards RAG build template exists"""
     print("\n" + "="*80)
     print("TEST 2: Battle Cards RAG Build Template")
     print("="*80)
     
+    from rag.dynamodb_prompts import get_latest_prompt_template
+    
     try:
         template_data = get_latest_prompt_template('battle_cards_rag_build_template')
         
@@ -103,9 +161,9 @@ def test_battle_cards_template():
         print(f"\n   Template preview (first 200 chars):")
         print(f"   {template_body[:200]}...")
         
-        # Check for expected placeholders
-        placeholders = ['{competitor}', '{company_name}', '{icp}']
-        missing = [p for p in placeholders if p not in template_body]
+        # Check for expected placeholders (one regex pass over the body)
+        found = set(_PLACEHOLDER_RE.findall(template_body))
+        missing = [f'{{{p}}}' for p in EXPECTED_PLACEHOLDERS if p not in found]
         
         if missing:
             print(f"\n⚠️  Missing placeholders: {missing}")
@@ -123,6 +181,8 @@ def test_competitors_loading(company_name='Algosec'):
     print(f"TEST 3: Competitors Loading for {company_name}")
     print("="*80)
     
+    from rag.s3_utils import get_company_data_manager
+    
     try:
         company_data_manager = get_company_data_manager()
         company_details = company_data_manager.get_company_data(company_name)
@@ -153,6 +213,8 @@ def test_system_prompts():
     print("TEST 4: System Prompts (Regression Test)")
     print("="*80)
     
+    from rag.dynamodb_prompts import get_latest_prompt_template
+    
     try:
         # Test main system prompts
         templates = [
@@ -160,9 +222,12 @@ def test_system_prompts():
             'asset_creation_rag_build_template'
         ]
         
+        # Independent round trips - fetch all templates concurrently
+        with ThreadPoolExecutor(max_workers=len(templates)) as executor:
+            fetched = dict(zip(templates, executor.map(get_latest_prompt_template, templates)))
+        
         results = {}
-        for template_name in templates:
-            template_data = get_latest_prompt_template(template_name)
+        for template_name, template_data in fetched.items():
             results[template_name] = template_data is not None
             
             if template_data:
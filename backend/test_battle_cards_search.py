@@ -4,8 +4,10 @@ Test script to verify battle cards search with minimal filtering.
 Compares results between strict filtering and minimal filtering.
 """
 
+import asyncio
 import sys
 import os
+import traceback
 from dotenv import load_dotenv
 
 # Add backend directory to path
@@ -13,6 +15,43 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 load_dotenv()
 
+async def _run_searches(vector_store, test_query, query_vector, collection, k, company_enumerations):
+    """
+    Run the minimal and strict searches concurrently with one shared query embedding.
+    The vector store is sync, so its searches go to worker threads; exceptions are returned, not raised.
+    """
+    return await asyncio.gather(
+        asyncio.to_thread(
+            vector_store.search_reddit_posts_minimal_filter,
+            query=test_query,
+            k=k,
+            collection_name=collection,
+            doc_type='reddit_post',
+            query_vector=query_vector
+        ),
+        asyncio.to_thread(
+            vector_store.search_reddit_posts,
+            query=test_query,
+            k=k,
+            company_enumerations=company_enumerations,
+            collection_name=collection,
+            company_name="algosec",
+            query_vector=query_vector
+        ),
+        return_exceptions=True
+    )
+
+def _print_top_results(results):
+    print("\nTop 3 Results:")
+    for i, doc in enumerate(results[:3], 1):
+        score = doc.metadata.get('score', 0.0)
+        title = doc.metadata.get('title', 'Untitled')[:60]
+        print(f"  {i}. {title}... (score: {score:.4f})")
+
+def _print_error(message, e):
+    print(f"❌ {message}: {e}")
+    traceback.print_exception(type(e), e, e.__traceback__)
+
 def test_battle_cards_search():
     """Test battle cards search with minimal filtering."""
     print("=" * 80)
@@ -26,79 +65,65 @@ def test_battle_cards_search():
     collection = "cybersecurity-summaries_1_0"
     k = 5
     
+    # Need company enumerations for strict filter
+    company_enumerations = {
+        "domain": ["algosec"],
+        "operational_surface": [],
+        "execution_surface": [],
+        "failure_type": []
+    }
+    
     print(f"\n📝 Test Query: {test_query}")
     print(f"🎯 Collection: {collection}")
     print(f"🔢 K: {k}")
     
+    # Embed once - both searches and the verification below reuse this vector
+    try:
+        query_vector = vector_store.embed_query_vector(test_query)
+    except Exception as e:
+        _print_error("Error embedding test query", e)
+        return
+    
+    results_minimal, results_strict = asyncio.run(
+        _run_searches(vector_store, test_query, query_vector, collection, k, company_enumerations)
+    )
+    
     # Test 1: Minimal filter (battle cards approach)
     print("\n" + "=" * 80)
     print("TEST 1: MINIMAL FILTER (Battle Cards)")
     print("=" * 80)
-    try:
-        results_minimal = vector_store.search_reddit_posts_minimal_filter(
-            query=test_query,
-            k=k,
-            collection_name=collection,
-            doc_type='reddit_post'
-        )
+    if isinstance(results_minimal, Exception):
+        _print_error("Error with minimal filter", results_minimal)
+        results_minimal = []
+    else:
         print(f"\n✅ Retrieved {len(results_minimal)} documents with MINIMAL filter")
         
         if results_minimal:
-            print("\nTop 3 Results:")
-            for i, doc in enumerate(results_minimal[:3], 1):
-                score = doc.metadata.get('score', 0.0)
-                title = doc.metadata.get('title', 'Untitled')[:60]
-                print(f"  {i}. {title}... (score: {score:.4f})")
+            _print_top_results(results_minimal)
         else:
             print("⚠️  No results with minimal filter")
-            
-    except Exception as e:
-        print(f"❌ Error with minimal filter: {e}")
-        import traceback
-        traceback.print_exc()
     
     # Test 2: Strict filter (regular approach) - for comparison
     print("\n" + "=" * 80)
     print("TEST 2: STRICT FILTER (Regular RAG)")
     print("=" * 80)
-    try:
-        # Need company enumerations for strict filter
-        company_enumerations = {
-            "domain": ["algosec"],
-            "operational_surface": [],
-            "execution_surface": [],
-            "failure_type": []
-        }
-        
-        results_strict = vector_store.search_reddit_posts(
-            query=test_query,
-            k=k,
-            company_enumerations=company_enumerations,
-            collection_name=collection,
-            company_name="algosec"
-        )
+    if isinstance(results_strict, Exception):
+        _print_error("Error with strict filter", results_strict)
+        results_strict = []
+    else:
         print(f"\n✅ Retrieved {len(results_strict)} documents with STRICT filter")
         
         if results_strict:
-            print("\nTop 3 Results:")
-            for i, doc in enumerate(results_strict[:3], 1):
-                score = doc.metadata.get('score', 0.0)
-                title = doc.metadata.get('title', 'Untitled')[:60]
-                print(f"  {i}. {title}... (score: {score:.4f})")
+            _print_top_results(results_strict)
         else:
             print("⚠️  No results with strict filter (expected for competitor queries)")
-            
-    except Exception as e:
-        print(f"❌ Error with strict filter: {e}")
-        import traceback
-        traceback.print_exc()
     
     # Summary
     print("\n" + "=" * 80)
     print("SUMMARY")
     print("=" * 80)
-    print(f"Minimal Filter: {len(results_minimal) if 'results_minimal' in locals() else 0} docs")
-    print(f"Strict Filter:  {len(results_strict) if 'results_strict' in locals() else 0} docs")
+    print(f"Minimal Filter: {len(results_minimal)} docs")
+    print(f"Strict Filter:  {len(results_strict)} docs")
     print("\n✅ For battle cards (competitor intel), minimal filter should return MORE results")
     print("✅ For company-specific insights, strict filter is more precise")
     
@@ -106,27 +131,10 @@ def test_battle_cards_search():
     print("\n" + "=" * 80)
     print("EMBEDDING VERIFICATION")
     print("=" * 80)
-    try:
-        from openai import OpenAI
-        from core.config import settings
-        
-        openai_client = OpenAI(
-            api_key=settings.DEEPINFRA_API_KEY, 
-            base_url=settings.DEEPINFRA_API_BASE_URL
-        )
-        response = openai_client.embeddings.create(
-            input=test_query,
-            model=vector_store._model_name
-        )
-        embedding = response.data[0].embedding
-        print(f"✅ Embedding model: {vector_store._model_name}")
-        print(f"✅ Embedding dimensions: {len(embedding)}")
-        print(f"✅ Sample values: [{embedding[0]:.4f}, {embedding[1]:.4f}, {embedding[2]:.4f}, ...]")
-        print("\n✅ Embeddings are working correctly!")
-        
-    except Exception as e:
-        print(f"❌ Error verifying embeddings: {e}")
+    print(f"✅ Embedding model: {vector_store._model_name}")
+    print(f"✅ Embedding dimensions: {len(query_vector)}")
+    print(f"✅ Sample values: [{query_vector[0]:.4f}, {query_vector[1]:.4f}, {query_vector[2]:.4f}, ...]")
+    print("\n✅ Embeddings are working correctly!")
 
 if __name__ == "__main__":
     test_battle_cards_search()
-
@@ -2,9 +2,9 @@
 Test script to verify cloud Qdrant connection and Reddit posts search.
 Run this to diagnose issues with remote Qdrant database.
 """
-from qdrant_client import QdrantClient
-from langchain_openai import OpenAIEmbeddings
-from langchain_community.vectorstores import Qdrant
+# qdrant_client / langchain imports live in the steps that use them, so an early exit
+# (e.g. missing OPENAI_API_KEY) doesn't pay for loading them
+import asyncio
 import os
 from dotenv import load_dotenv
 
@@ -31,7 +31,8 @@ print(f"\n✓ OpenAI API Key: {'*' * 20}{OPENAI_API_KEY[-10:]}")
 # Step 1: Test connection
 print("\n1. Testing Qdrant connection...")
 try:
-    client = QdrantClient(url=CLOUD_URL, api_key=CLOUD_API_KEY)
+    from qdrant_client import QdrantClient
+    client = QdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
     print("✓ Connected to cloud Qdrant")
 except Exception as e:
     print(f"❌ Connection failed: {e}")
@@ -66,6 +67,7 @@ else:
 # Step 4: Test embeddings
 print("\n4. Testing OpenAI embeddings...")
 try:
+    from langchain_openai import OpenAIEmbeddings
     embeddings = OpenAIEmbeddings(openai_api_key=OPENAI_API_KEY)
     test_vector = embeddings.embed_query("test")
     print(f"✓ Embeddings working, vector size: {len(test_vector)}")
@@ -76,6 +78,7 @@ except Exception as e:
 # Step 5: Create vector store
 print("\n5. Creating LangChain Qdrant wrapper...")
 try:
+    from langchain_community.vectorstores import Qdrant
     vector_store = Qdrant(
         client=client,
         collection_name="reddit_posts",
@@ -94,30 +97,54 @@ test_queries = [
     "firewall configuration",
 ]
 
-for query in test_queries:
-    print(f"\n   Query: '{query}'")
+async def run_searches(query_vectors):
+    """Step 6's batched search and step 7's scored search are independent - run them concurrently"""
+    from qdrant_client import AsyncQdrantClient
+    from qdrant_client.models import QueryRequest
+    aclient = AsyncQdrantClient(url=QDRANT_URL, api_key=QDRANT_API_KEY)
     try:
-        results = vector_store.similarity_search(query, k=3)
-        print(f"   ✓ Found {len(results)} results")
-        
-        for i, doc in enumerate(results, 1):
-            metadata = doc.metadata if hasattr(doc, 'metadata') else {}
-            print(f"      Result {i}:")
-            print(f"         Author: {metadata.get('author', 'N/A')}")
-            print(f"         Text: {doc.page_content[:100]}...")
-            print(f"         Metadata keys: {list(metadata.keys())}")
-    except Exception as e:
-        print(f"   ❌ Search failed: {e}")
+        return await asyncio.gather(
+            aclient.query_batch_points(
+                collection_name="reddit_posts",
+                requests=[QueryRequest(query=vector, limit=3, with_payload=True) for vector in query_vectors],
+            ),
+            asyncio.to_thread(vector_store.similarity_search_with_score, "cybersecurity", k=3),
+            return_exceptions=True,
+        )
+    finally:
+        await aclient.close()
+
+# One embeddings request for all queries, then both searches in flight at once
+try:
+    query_vectors = embeddings.embed_documents(test_queries)
+    batch_results, results_with_scores = asyncio.run(run_searches(query_vectors))
+except Exception as e:
+    batch_results = results_with_scores = e
+
+if isinstance(batch_results, Exception):
+    print(f"   ❌ Search failed: {batch_results}")
+    batch_results = []
+
+for query, response in zip(test_queries, batch_results):
+    print(f"\n   Query: '{query}'")
+    print(f"   ✓ Found {len(response.points)} results")
+    
+    for i, point in enumerate(response.points, 1):
+        payload = point.payload or {}
+        metadata = payload.get(Qdrant.METADATA_KEY) or {}
+        print(f"      Result {i}:")
+        print(f"         Author: {metadata.get('author', 'N/A')}")
+        print(f"         Text: {(payload.get(Qdrant.CONTENT_KEY) or '')[:100]}...")
+        print(f"         Metadata keys: {list(metadata.keys())}")
 
 # Step 7: Test with score
 print("\n7. Testing search with scores...")
-try:
-    results_with_scores = vector_store.similarity_search_with_score("cybersecurity", k=3)
+if isinstance(results_with_scores, Exception):
+    print(f"❌ Search with scores failed: {results_with_scores}")
+else:
     print(f"✓ Found {len(results_with_scores)} results with scores:")
     for i, (doc, score) in enumerate(results_with_scores, 1):
         print(f"   {i}. Score: {score:.4f}, Author: {doc.metadata.get('author', 'N/A')}")
-except Exception as e:
-    print(f"❌ Search with scores failed: {e}")
 
 print("\n" + "=" * 60)
 print("Test completed!")
@@ -5,6 +5,7 @@ Run this to test the integration before deploying.
 
 import sys
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -19,11 +20,7 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 
-from rag.dynamodb_prompts import (
-    get_latest_prompt_template,
-    get_asset_creation_rag_build_template,
-    get_asset_creation_template
-)
+from rag.dynamodb_prompts import get_latest_prompt_template
 
 def test_dynamodb_prompts():
     """Test DynamoDB prompt template retrieval."""
@@ -31,9 +28,16 @@ def test_dynamodb_prompts():
     print("Testing DynamoDB Prompt Template Retrieval")
     print("="*80 + "\n")
     
+    # edited_at_iso is a range key, so BatchGetItem can't ask for "latest" - instead query each
+    # distinct template once, concurrently, and share the results across the tests below.
+    # Safe across threads: get_latest_prompt_template reads through a low-level client, not a Table
+    template_names = ['asset_creation_rag_build_template', 'asset_creation_template']
+    with ThreadPoolExecutor(max_workers=len(template_names)) as executor:
+        detailed_rag_build, detailed_asset_creation = executor.map(get_latest_prompt_template, template_names)
+    
     # Test 1: Get asset_creation_rag_build_template
     print("Test 1: Retrieving 'asset_creation_rag_build_template'...")
-    template1 = get_asset_creation_rag_build_template()
+    template1 = detailed_rag_build['template_body'] if detailed_rag_build else None
     if template1:
         print(f"✓ Success! Retrieved template ({len(template1)} chars)")
         print(f"Preview: {template1[:200]}...")
@@ -44,7 +48,7 @@ def test_dynamodb_prompts():
     
     # Test 2: Get asset_creation_template
     print("Test 2: Retrieving 'asset_creation_template'...")
-    template2 = get_asset_creation_template()
+    template2 = detailed_asset_creation['template_body'] if detailed_asset_creation else None
     if template2:
         print(f"✓ Success! Retrieved template ({len(template2)} chars)")
         print(f"Preview: {template2[:200]}...")
@@ -55,7 +59,7 @@ def test_dynamodb_prompts():
     
     # Test 3: Get detailed info
     print("Test 3: Getting detailed template info...")
-    detailed = get_latest_prompt_template('asset_creation_rag_build_template')
+    detailed = detailed_rag_build
     if detailed:
         print(f"✓ Success!")
         print(f"  - Edited at (ISO): {detailed.get('edited_at_iso')}")
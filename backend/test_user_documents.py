@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for adding user documents when the collection disappears mid-session.
+
+The vector store remembers collections it has confirmed, so an upload after the collection
+was deleted elsewhere (maintenance API, another worker) hits a "not found" upsert.
+add_documents and aadd_documents must both recreate the collection and retry.
+
+Uses a throwaway user id and deletes its collection afterwards.
+Run: python test_user_documents.py
+"""
+
+import asyncio
+import sys
+import os
+import traceback
+from dotenv import load_dotenv
+
+# Add backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+load_dotenv()
+
+TEST_USER_ID = 999_999_001
+
+
+def _delete_behind_the_cache(vector_store, collection_name):
+    """Delete the collection with the raw client, so the vector store still believes it exists."""
+    vector_store.client.delete_collection(collection_name)
+    assert collection_name in vector_store._existing_collections
+
+
+def _count(vector_store, collection_name):
+    return vector_store.client.count(collection_name=collection_name, exact=True).count
+
+
+def test_user_documents():
+    """Sync and async adds both survive a deleted collection"""
+    from langchain_core.documents import Document
+    from rag.vectorstore import vector_store
+
+    collection_name = vector_store.get_collection_name(TEST_USER_ID)
+
+    def documents():
+        return [Document(page_content=f"Firewall rule review checklist, item {i}", metadata={}) for i in range(3)]
+
+    print("\n" + "=" * 80)
+    print("USER DOCUMENTS - MISSING COLLECTION")
+    print("=" * 80)
+
+    results = {}
+    try:
+        vector_store.create_collection_if_not_exists(TEST_USER_ID)
+
+        print("\n1. add_documents after the collection was deleted...")
+        _delete_behind_the_cache(vector_store, collection_name)
+        vector_store.add_documents(TEST_USER_ID, documents(), file_id=1, filename="sync.txt", file_type="txt")
+        results["add_documents"] = _count(vector_store, collection_name) == 3
+        print(f"{'✅' if results['add_documents'] else '❌'} {_count(vector_store, collection_name)} points")
+
+        print("\n2. aadd_documents after the collection was deleted...")
+        _delete_behind_the_cache(vector_store, collection_name)
+        asyncio.run(vector_store.aadd_documents(TEST_USER_ID, documents(), file_id=2, filename="async.txt", file_type="txt"))
+        results["aadd_documents"] = _count(vector_store, collection_name) == 3
+        print(f"{'✅' if results['aadd_documents'] else '❌'} {_count(vector_store, collection_name)} points")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        traceback.print_exc()
+        return False
+    finally:
+        vector_store.clear_user_collection(TEST_USER_ID)
+
+    return all(results.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if test_user_documents() else 1)
@@ -5,19 +5,21 @@ This script demonstrates how to update a prompt template in DynamoDB.
 Modify this for your specific use case.
 """
 
-import boto3
 import time
-import os
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
-# Initialize DynamoDB with region
-AWS_REGION = os.getenv('AWS_REGION', os.getenv('AWS_DEFAULT_REGION', 'us-east-1'))
-dynamodb = boto3.resource('dynamodb', region_name=AWS_REGION)
-table = dynamodb.Table('prompts_templates_tbl')
+# Initialize DynamoDB with region (shared session and connection pool)
+from _aws import BOTO_CONFIG, SESSION
+from rag.dynamodb_prompts import with_template_kind
+
+_DYNAMO = SESSION.resource('dynamodb', config=BOTO_CONFIG)
+table = _DYNAMO.Table('prompts_templates_tbl')
+# Low-level client for read-only lookups: only the projected attributes are returned and decoded
+_CLIENT = SESSION.client('dynamodb', config=BOTO_CONFIG)
 
 # Example 1: Update the retrieval prompt (VECTOR_DB_RETREIVAL_PROMPT)
 def update_retrieval_prompt(edited_by: str):
@@ -57,7 +59,7 @@ Operational pain points: {backgrounds}
     print(f"  Editor: {edited_by}")
     print(f"  Length: {len(new_prompt)} chars")
     
-    table.put_item(Item=item)
+    table.put_item(Item=with_template_kind(item))
     print("✓ Successfully updated retrieval prompt!")
 
 
@@ -95,7 +97,7 @@ Rules:
     print(f"  Editor: {edited_by}")
     print(f"  Length: {len(new_prompt)} chars")
     
-    table.put_item(Item=item)
+    table.put_item(Item=with_template_kind(item))
     print("✓ Successfully updated system prompt!")
 
 
@@ -103,8 +105,14 @@ Rules:
 def view_current_prompt(template_name: str):
     """View the current version of a prompt."""
     
-    response = table.query(
-        KeyConditionExpression=boto3.dynamodb.conditions.Key('template_name').eq(template_name)
+    # edited_at_iso is the sort key - newest version first, and only that one
+    response = _CLIENT.query(
+        TableName='prompts_templates_tbl',
+        KeyConditionExpression='template_name = :n',
+        ExpressionAttributeValues={':n': {'S': template_name}},
+        ProjectionExpression='edited_at_iso, edited_by_sub, template_body',
+        ScanIndexForward=False,
+        Limit=1
     )
     
     items = response.get('Items', [])
@@ -113,18 +121,18 @@ def view_current_prompt(template_name: str):
         print(f"No items found for template: {template_name}")
         return
     
-    # Get latest
-    latest = max(items, key=lambda x: x.get('edited_at_iso', 0))
+    latest = items[0]
     
-    timestamp = int(latest.get('edited_at_iso', 0))
+    timestamp = int(latest.get('edited_at_iso', {}).get('N', 0))
+    template_body = latest.get('template_body', {}).get('S', '')
     
     print(f"\nCurrent version of '{template_name}':")
-    print(f"  Edited by: {latest.get('edited_by_sub')}")
+    print(f"  Edited by: {latest.get('edited_by_sub', {}).get('S')}")
     print(f"  Edited at: {timestamp} ({datetime.fromtimestamp(timestamp)})")
-    print(f"  Length: {len(latest.get('template_body', ''))} chars")
+    print(f"  Length: {len(template_body)} chars")
     print(f"\nPreview:")
     print("-" * 80)
-    print(latest.get('template_body', '')[:300] + "...")
+    print(template_body[:300] + "...")
     print("-" * 80)
 
 
@@ -132,24 +140,30 @@ def view_current_prompt(template_name: str):
 def list_all_versions(template_name: str):
     """List all versions of a prompt template."""
     
-    response = table.query(
-        KeyConditionExpression=boto3.dynamodb.conditions.Key('template_name').eq(template_name)
+    # Newest first straight from the sort key; the paginator follows LastEvaluatedKey so long
+    # histories aren't cut at 1 MB, and versions are printed page by page as they arrive.
+    # Only the header attributes are fetched - template bodies are most of each item's size
+    pages = _CLIENT.get_paginator('query').paginate(
+        TableName='prompts_templates_tbl',
+        KeyConditionExpression='template_name = :n',
+        ExpressionAttributeValues={':n': {'S': template_name}},
+        ProjectionExpression='edited_at_iso, edited_by_sub',
+        ScanIndexForward=False
     )
     
-    items = response.get('Items', [])
-    
-    if not items:
+    count = 0
+    for page in pages:
+        for item in page.get('Items', []):
+            if count == 0:
+                print(f"\nVersion history for '{template_name}':")
+                print("-" * 80)
+            count += 1
+            timestamp = int(item.get('edited_at_iso', {}).get('N', 0))
+            print(f"{count}. {datetime.fromtimestamp(timestamp)} by {item.get('edited_by_sub', {}).get('S')}")
+    
+    if not count:
         print(f"No items found for template: {template_name}")
         return
-    
-    # Sort by timestamp descending
-    items_sorted = sorted(items, key=lambda x: x.get('edited_at_iso', 0), reverse=True)
-    
-    print(f"\nVersion history for '{template_name}':")
-    print("-" * 80)
-    for i, item in enumerate(items_sorted, 1):
-        timestamp = int(item.get('edited_at_iso', 0))
-        print(f"{i}. {datetime.fromtimestamp(timestamp)} by {item.get('edited_by_sub')} ({len(item.get('template_body', ''))} chars)")
     print("-" * 80)
 
 
@@ -1,44 +1,72 @@
 """
 Quick script to check what's in your Qdrant databases
+
+Usage: python check_qdrant.py [--repeat N]
 """
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
 from qdrant_client import QdrantClient
 
-# 1. Check Docker Local Qdrant (MVP app)
-print("=== DOCKER LOCAL QDRANT (MVP APP) ===")
-local_client = QdrantClient(url="http://localhost:6333")
-
-try:
-    collections = local_client.get_collections()
-    print(f"Collections: {len(collections.collections)}")
-    for col in collections.collections:
-        info = local_client.get_collection(col.name)
-        print(f"  - {col.name}: {info.points_count} points, {info.config.params.vectors.size}D vectors")
-except Exception as e:
-    print(f"Error: {e}")
-
-print()
-from dotenv import load_dotenv
-from pathlib import Path
-# Initialize clients - load from root .env file
-project_root = Path(__file__).parent.parent
-env_path = project_root / ".env"
-load_dotenv(dotenv_path=env_path)
-QDRANT_URL = os.getenv("QDRANT_URL")
-QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
-
-# 2. Check Cloud Qdrant (Reddit posts)
-print("=== CLOUD QDRANT (REDDIT POSTS) ===")
-cloud_client = QdrantClient(
-    url=QDRANT_URL,
-    api_key=QDRANT_API_KEY
-)
-
-try:
-    collections = cloud_client.get_collections()
-    print(f"Collections: {len(collections.collections)}")
-    for col in collections.collections:
-        info = cloud_client.get_collection(col.name)
-        print(f"  - {col.name}: {info.points_count} points, {info.config.params.vectors.size}D vectors")
-except Exception as e:
-    print(f"Error: {e}")
+LOCAL_URL = "http://localhost:6333"
+
+
+def collection_infos(client):
+    """(name, info) for every collection; the per-collection lookups run concurrently."""
+    names = [col.name for col in client.get_collections().collections]
+    if not names:
+        return []
+    with ThreadPoolExecutor(max_workers=min(32, len(names))) as executor:
+        return list(zip(names, executor.map(client.get_collection, names)))
+
+
+def check(client, label):
+    """Report for one cluster, returned as text so clusters can be checked concurrently."""
+    lines = [f"=== {label} ==="]
+    try:
+        infos = collection_infos(client)
+        lines.append(f"Collections: {len(infos)}")
+        for name, info in infos:
+            lines.append(f"  - {name}: {info.points_count} points, {info.config.params.vectors.size}D vectors")
+    except Exception as e:
+        lines.append(f"Error: {e}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1, help="run the check N times, reusing the same clients")
+    args = parser.parse_args()
+
+    from dotenv import load_dotenv
+    from pathlib import Path
+    # Initialize clients - load from root .env file
+    project_root = Path(__file__).parent.parent
+    env_path = project_root / ".env"
+    load_dotenv(dotenv_path=env_path)
+    QDRANT_URL = os.getenv("QDRANT_URL")
+    QDRANT_API_KEY = os.getenv("QDRANT_API_KEY")
+
+    # Built once and reused across repeats. docker-compose only publishes the HTTP port locally;
+    # the cloud cluster follows the backend's QDRANT_PREFER_GRPC setting (parsed like core.config.Settings)
+    clusters = [
+        # 1. Docker Local Qdrant (MVP app)
+        (QdrantClient(url=LOCAL_URL), "DOCKER LOCAL QDRANT (MVP APP)"),
+        # 2. Cloud Qdrant (Reddit posts)
+        (QdrantClient(
+            url=QDRANT_URL,
+            api_key=QDRANT_API_KEY,
+            prefer_grpc=os.getenv("QDRANT_PREFER_GRPC", "false").lower() in ("1", "true", "yes")
+        ), "CLOUD QDRANT (REDDIT POSTS)"),
+    ]
+
+    # Different endpoints - inspect both clusters at the same time
+    with ThreadPoolExecutor(max_workers=len(clusters)) as executor:
+        for _ in range(args.repeat):
+            for report in executor.map(lambda cluster: check(*cluster), clusters):
+                print(report)
+                print()
+
 
+if __name__ == "__main__":
+    main()